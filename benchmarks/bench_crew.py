@@ -0,0 +1,80 @@
+"""Offline benchmark of the crew pipeline using the mock LLM.
+
+Runs every request of a JSONL corpus through execute_crewai_travel_request with
+the scripted stand-in LLM, so the numbers reflect CrewAI orchestration overhead
+plus the simulated LLM latency, without any network access.
+
+Usage:
+    python benchmarks/bench_crew.py [--corpus PATH] [--iterations N] [--concurrency N]
+                                    [--latency SPEC]
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "tests" / "data" / "router_corpus.jsonl"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--iterations", type=int, default=1, help="passes over the corpus")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", default="none",
+                        help="mock LLM latency, e.g. fixed:0.2, uniform:0.1,0.5 or lognormal:0.7,0.4")
+    args = parser.parse_args()
+
+    # Must be set before the agent module reads its configuration
+    os.environ["TRAVEL_AGENT_MOCK_LLM"] = "true"
+    os.environ["TRAVEL_AGENT_MOCK_LLM_LATENCY"] = args.latency
+    os.environ["TRAVEL_AGENT_RESPONSE_CACHE"] = "false"
+    from crewai_travel_agent import execute_crewai_travel_request
+    from mock_llm import MockLLM
+    from request_corpus import load_travel_requests
+
+    requests = [record["request"] for record in load_travel_requests(args.corpus)] * args.iterations
+    latencies = []
+    errors = 0
+
+    def run(travel_request):
+        start = time.perf_counter()
+        try:
+            execute_crewai_travel_request(travel_request)
+            return time.perf_counter() - start, None
+        except Exception as error:
+            return time.perf_counter() - start, error
+
+    calls_before = MockLLM.call_count()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for latency, error in executor.map(run, requests):
+            latencies.append(latency)
+            errors += error is not None
+    elapsed = time.perf_counter() - start
+    llm_calls = MockLLM.call_count() - calls_before
+
+    latencies.sort()
+    print(f"requests: {len(requests)}  errors: {errors}  concurrency: {args.concurrency}  latency model: {args.latency}")
+    print(f"latency p50: {percentile(latencies, 0.50) * 1000:.1f} ms  "
+          f"p95: {percentile(latencies, 0.95) * 1000:.1f} ms  p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"throughput: {len(requests) / elapsed:.2f} requests/s")
+    print(f"LLM calls per request: {llm_calls / max(len(requests), 1):.2f}")
+    # ru_maxrss is reported in kilobytes on Linux
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Microbenchmark for travel_router over the labeled router corpus.
+
+Usage:
+    python benchmarks/bench_router.py [--iterations N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from travel_router import route_travel_request
+
+CORPUS_PATH = Path(__file__).parent.parent / "tests" / "data" / "router_corpus.jsonl"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = [json.loads(line) for line in CORPUS_PATH.read_text().splitlines() if line.strip()]
+    correct = sum(list(route_travel_request(case["request"]).services) == case["services"] for case in corpus)
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        for case in corpus:
+            route_travel_request(case["request"])
+    elapsed = time.perf_counter() - start
+    calls = args.iterations * len(corpus)
+
+    print(f"accuracy: {correct}/{len(corpus)}")
+    print(f"routed {calls} requests in {elapsed:.3f}s ({elapsed / calls * 1e6:.1f} us/request)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Cold-start benchmark for the travel agent module.
+
+Each run starts a fresh interpreter, so nothing is cached in ``sys.modules``. It
+times ``import crewai_travel_agent`` on its own and followed by ``init()``, then
+uses ``python -X importtime`` to list the module's own imports that cost the most.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--top N] [--telemetry]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+TIMED_SCRIPT = """
+import time
+start = time.perf_counter()
+import crewai_travel_agent
+imported = time.perf_counter()
+if {run_init}:
+    crewai_travel_agent.init()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def run_python(args: list, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+                          check=True)
+
+
+def timed_start(run_init: bool, env: dict) -> tuple:
+    output = run_python(["-c", TIMED_SCRIPT.format(run_init=run_init)], env).stdout.split()
+    return float(output[-2]), float(output[-1])
+
+
+def slowest_imports(env: dict, top: int) -> list:
+    """``(cumulative seconds, module)`` for the slowest imports made directly by the module."""
+    stderr = run_python(["-X", "importtime", "-c", "import crewai_travel_agent"], env).stderr
+    direct = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Imports are listed after the imports they trigger, indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            direct.append((int(cumulative) / 1e6, name.strip()))
+        elif depth == 0:
+            if name.strip() == "crewai_travel_agent":
+                return sorted(direct, reverse=True)[:top]
+            direct = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--telemetry", action="store_true", help="include Monocle setup in init()")
+    args = parser.parse_args()
+
+    env = dict(os.environ, TRAVEL_AGENT_TELEMETRY=str(args.telemetry).lower(),
+               TRAVEL_AGENT_MONOCLE_EXPORTERS="file")
+    imports = [timed_start(False, env)[0] for _ in range(args.runs)]
+    inits = [timed_start(True, env)[1] for _ in range(args.runs)]
+
+    print(f"runs: {args.runs}  telemetry: {args.telemetry}")
+    print(f"import crewai_travel_agent: median {statistics.median(imports) * 1000:.1f} ms  "
+          f"max {max(imports) * 1000:.1f} ms")
+    print(f"init(): median {statistics.median(inits) * 1000:.1f} ms  max {max(inits) * 1000:.1f} ms")
+    print("slowest imports of crewai_travel_agent (cumulative):")
+    for seconds, module in slowest_imports(env, args.top):
+        print(f"  {seconds * 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
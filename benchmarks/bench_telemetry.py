@@ -0,0 +1,94 @@
+"""Hot-path overhead of tracing in each telemetry mode.
+
+Simulates requests that each produce a trace shaped like a crew run (a turn, three
+agent invocations, two tool calls and LLM calls, with attributes) from several
+threads at once, and reports the time spent in the request threads per request.
+Spans are written to a temporary directory with the rotating file exporter.
+
+Usage:
+    python benchmarks/bench_telemetry.py [--requests N] [--threads N] [--sample-rate R] [--tail-rate R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from telemetry import RotatingFileSpanExporter, TelemetrySettings, sampled_span_processors
+
+SPANS = [("agentic.invocation", ["agentic.tool.invocation", "inference"])] * 2 + [("agentic.invocation", ["inference"])]
+
+
+def simulated_request(tracer):
+    with tracer.start_as_current_span("agentic.turn") as turn:
+        turn.set_attribute("input", "Book a flight from San Francisco to Mumbai for 26th April 2026.")
+        for agent_span, children in SPANS:
+            with tracer.start_as_current_span(agent_span) as agent:
+                agent.set_attribute("entity.1.name", "Flight Booking Agent")
+                for child in children:
+                    with tracer.start_as_current_span(child) as span:
+                        span.set_attribute("entity.1.name", child)
+                        span.add_event("data.output", {"response": "Flight booked from SFO to BOM."})
+
+
+def measure(provider, requests: int, threads: int) -> float:
+    tracer = provider.get_tracer("bench")
+
+    def run(_):
+        start = time.perf_counter()
+        simulated_request(tracer)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        durations = list(executor.map(run, range(requests)))
+    provider.force_flush()
+    provider.shutdown()
+    return sum(durations) / len(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="head sample rate in sampled mode")
+    parser.add_argument("--tail-rate", type=float, default=0.5, help="tail sample rate in sampled mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        providers = {"no tracing": TracerProvider(sampler=TraceIdRatioBased(0.0))}
+
+        full = TracerProvider()
+        full.add_span_processor(SimpleSpanProcessor(RotatingFileSpanExporter(directory, prefix="full")))
+        providers["full, synchronous file export"] = full
+
+        batched = TracerProvider()
+        for processor in sampled_span_processors("file", TelemetrySettings(mode="sampled", file_dir=directory)):
+            batched.add_span_processor(processor)
+        providers["sampled mode at rate 1.0 (batch export only)"] = batched
+
+        settings = TelemetrySettings(mode="sampled", head_sample_rate=args.sample_rate,
+                                     tail_sample_rate=args.tail_rate, file_dir=directory)
+        sampled = TracerProvider(sampler=ParentBased(TraceIdRatioBased(args.sample_rate)))
+        for processor in sampled_span_processors("file", settings):
+            sampled.add_span_processor(processor)
+        providers[f"sampled mode, head {args.sample_rate}, tail {args.tail_rate}"] = sampled
+
+        print(f"requests: {args.requests}  threads: {args.threads}  spans per request: "
+              f"{1 + sum(1 + len(children) for _, children in SPANS)}")
+        baseline = None
+        for name, provider in providers.items():
+            per_request = measure(provider, args.requests, args.threads)
+            baseline = per_request if baseline is None else baseline
+            print(f"{name:48s} {per_request * 1e6:8.1f} us/request  "
+                  f"(+{(per_request - baseline) * 1e6:.1f} us over no tracing)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Pluggable backends behind the book_hotel and book_flight tools.
+
+``SimulatedBookingBackend`` keeps the original in-process behaviour (a short
+simulated delay and a success message). ``HttpBookingBackend`` talks to a booking
+service over a pooled HTTP client with timeouts, retries with exponential backoff
+and an ``Idempotency-Key`` header, so a retried or duplicated booking is only made
+once. ``fake_booking_server`` provides a local service for development.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+
+import httpx
+
+# Scope for idempotency keys, normally one per travel request. Without a scope every
+# booking gets a fresh key, so unrelated travelers are never merged. Threads do not
+# inherit it; code that books from its own threads runs them in a copy of the context.
+_booking_scope = contextvars.ContextVar("booking_scope", default=None)
+
+
+@contextmanager
+def booking_scope(scope: str):
+    """Make identical bookings inside the ``with`` block share idempotency keys."""
+    token = _booking_scope.set(scope)
+    try:
+        yield
+    finally:
+        _booking_scope.reset(token)
+
+
+def booking_idempotency_key(kind: str, booking: dict) -> str:
+    scope = _booking_scope.get()
+    if scope is None:
+        return str(uuid.uuid4())
+    payload = json.dumps({"scope": scope, "kind": kind, "booking": booking}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def hotel_confirmation(hotel_name: str, city: str, check_in_date: str, nights: int) -> dict:
+    return {
+        "status": "success",
+        "message": f"Successfully booked a stay at {hotel_name} in {city} from {check_in_date} for {nights} nights."
+    }
+
+
+def flight_confirmation(from_airport: str, to_airport: str, date: str) -> dict:
+    return {
+        "status": "success",
+        "message": f"Flight booked from {from_airport} to {to_airport} for {date}."
+    }
+
+
+# Worker threads for the synchronous side of batch bookings
+_batch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="booking")
+
+
+def _run_batch(book, bookings: list, idempotency_keys: list) -> list:
+    futures = [_batch_executor.submit(book, **booking, idempotency_key=key)
+               for booking, key in zip(bookings, idempotency_keys)]
+    return [future.result() for future in futures]
+
+
+class BookingBackend:
+    """Interface for booking services. Every method returns a ``status``/``message`` dict.
+
+    The batch methods return one such dict per booking, in order. By default they
+    run the single bookings concurrently; backends with a batch endpoint can
+    override them.
+    """
+
+    def book_hotel(self, hotel_name: str, city: str, check_in_date: str, nights: int, idempotency_key: str) -> dict:
+        raise NotImplementedError
+
+    async def abook_hotel(self, hotel_name: str, city: str, check_in_date: str, nights: int,
+                          idempotency_key: str) -> dict:
+        raise NotImplementedError
+
+    def book_flight(self, from_airport: str, to_airport: str, date: str, idempotency_key: str) -> dict:
+        raise NotImplementedError
+
+    async def abook_flight(self, from_airport: str, to_airport: str, date: str, idempotency_key: str) -> dict:
+        raise NotImplementedError
+
+    def book_hotels(self, bookings: list, idempotency_keys: list) -> list:
+        return _run_batch(self.book_hotel, bookings, idempotency_keys)
+
+    async def abook_hotels(self, bookings: list, idempotency_keys: list) -> list:
+        return await asyncio.gather(*(self.abook_hotel(**booking, idempotency_key=key)
+                                      for booking, key in zip(bookings, idempotency_keys)))
+
+    def book_flights(self, bookings: list, idempotency_keys: list) -> list:
+        return _run_batch(self.book_flight, bookings, idempotency_keys)
+
+    async def abook_flights(self, bookings: list, idempotency_keys: list) -> list:
+        return await asyncio.gather(*(self.abook_flight(**booking, idempotency_key=key)
+                                      for booking, key in zip(bookings, idempotency_keys)))
+
+
+class SimulatedBookingBackend(BookingBackend):
+    """In-process backend that waits ``latency`` seconds and always succeeds."""
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+
+    def book_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        time.sleep(self.latency)  # Simulate processing time
+        return hotel_confirmation(hotel_name, city, check_in_date, nights)
+
+    async def abook_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        await asyncio.sleep(self.latency)
+        return hotel_confirmation(hotel_name, city, check_in_date, nights)
+
+    def book_flight(self, from_airport, to_airport, date, idempotency_key):
+        time.sleep(self.latency)  # Simulate processing time
+        return flight_confirmation(from_airport, to_airport, date)
+
+    async def abook_flight(self, from_airport, to_airport, date, idempotency_key):
+        await asyncio.sleep(self.latency)
+        return flight_confirmation(from_airport, to_airport, date)
+
+
+class HttpBookingBackend(BookingBackend):
+    """Backend for a booking service exposing ``POST /hotels`` and ``POST /flights``.
+
+    Transport errors, timeouts, 429 and 5xx responses are retried up to
+    ``max_retries`` times, waiting ``backoff * 2 ** attempt`` seconds in between.
+    Every attempt carries the same idempotency key.
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str, timeout: float = 5.0, max_retries: int = 3, backoff: float = 0.2,
+                 max_connections: int = 20):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self._client: Optional[httpx.Client] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop = None
+        self._lock = threading.Lock()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(base_url=self.base_url, timeout=self.timeout, limits=self._limits())
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # An AsyncClient is tied to the event loop it was created on; a new loop gets a new client
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._async_client_loop is not loop:
+                self._async_http_client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout,
+                                                            limits=self._limits())
+                self._async_client_loop = loop
+            return self._async_http_client
+
+    def _should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in self.RETRY_STATUS_CODES
+
+    @staticmethod
+    def _result(response: Optional[httpx.Response], error: Optional[Exception]) -> dict:
+        if response is not None and response.is_success:
+            return response.json()
+        reason = f"HTTP {response.status_code}" if response is not None else repr(error)
+        return {"status": "error", "message": f"Booking service failed: {reason}"}
+
+    def _post(self, path: str, booking: dict, idempotency_key: str) -> dict:
+        client = self._sync_client()
+        attempt = 0
+        while True:
+            response = error = None
+            try:
+                response = client.post(path, json=booking, headers={"Idempotency-Key": idempotency_key})
+            except httpx.TransportError as transport_error:
+                error = transport_error
+            if not self._should_retry(attempt, response):
+                return self._result(response, error)
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    async def _apost(self, path: str, booking: dict, idempotency_key: str) -> dict:
+        client = self._async_client()
+        attempt = 0
+        while True:
+            response = error = None
+            try:
+                response = await client.post(path, json=booking, headers={"Idempotency-Key": idempotency_key})
+            except httpx.TransportError as transport_error:
+                error = transport_error
+            if not self._should_retry(attempt, response):
+                return self._result(response, error)
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def book_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        booking = {"hotel_name": hotel_name, "city": city, "check_in_date": check_in_date, "nights": nights}
+        return self._post("/hotels", booking, idempotency_key)
+
+    async def abook_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        booking = {"hotel_name": hotel_name, "city": city, "check_in_date": check_in_date, "nights": nights}
+        return await self._apost("/hotels", booking, idempotency_key)
+
+    def book_flight(self, from_airport, to_airport, date, idempotency_key):
+        booking = {"from_airport": from_airport, "to_airport": to_airport, "date": date}
+        return self._post("/flights", booking, idempotency_key)
+
+    async def abook_flight(self, from_airport, to_airport, date, idempotency_key):
+        booking = {"from_airport": from_airport, "to_airport": to_airport, "date": date}
+        return await self._apost("/flights", booking, idempotency_key)
+
+
+_backend: BookingBackend = SimulatedBookingBackend()
+
+
+def get_booking_backend() -> BookingBackend:
+    return _backend
+
+
+def set_booking_backend(backend: BookingBackend) -> None:
+    """Swap the backend used by every booking tool."""
+    global _backend
+    _backend = backend
@@ -0,0 +1,212 @@
+"""CrewAI booking tools backed by the pluggable booking backends.
+
+Every tool reports its result to the crew's ``CrewEvents`` relay, if it has one.
+With the crew's ``AgentGuard`` a tool called again with the same arguments in the
+same request returns the earlier result instead of booking again. A tool created
+with ``answer_on_success`` ends its agent's task with its result as soon as a call
+succeeds. The batch tools book several reservations concurrently in one call.
+"""
+import time
+from typing import Any, Optional
+
+from crewai.tools import BaseTool
+from crewai.tools.structured_tool import CrewStructuredTool
+from pydantic import BaseModel, Field
+
+from booking_backends import booking_idempotency_key, get_booking_backend
+
+
+class _BookingStructuredTool(CrewStructuredTool):
+    """Structured tool that reads ``result_as_answer`` from its booking tool, which sets it on every call."""
+
+    def __init__(self, tool: "BookingTool", **kwargs):
+        self._tool = tool
+        super().__init__(**kwargs)
+
+    @property
+    def result_as_answer(self) -> bool:
+        return self._tool.result_as_answer
+
+    @result_as_answer.setter
+    def result_as_answer(self, value: bool) -> None:
+        pass
+
+
+class BookingTool(BaseTool):
+    """Base for the booking tools: reports every booking result to the crew's event relay."""
+    events: Any = Field(default=None, exclude=True)
+    guard: Any = Field(default=None, exclude=True)
+    # Make a successful result the agent's final answer, without another LLM call
+    answer_on_success: bool = False
+
+    def to_structured_tool(self) -> CrewStructuredTool:
+        # CrewAI copies result_as_answer into the structured tool once; it has to follow every call
+        self._set_args_schema()
+        return _BookingStructuredTool(self, name=self.name, description=self.description,
+                                      args_schema=self.args_schema, func=self._run)
+
+    def _answer(self, result: dict):
+        """``result``, or just its message when it is to be the agent's final answer, which must be text."""
+        self.result_as_answer = self.answer_on_success and result.get("status") == "success"
+        return result["message"] if self.result_as_answer else result
+
+    def _earlier_result(self, arguments: dict) -> Optional[dict]:
+        """The result of an identical successful call earlier in this request, if the guard saw one."""
+        result = self.guard.recall(self.name, arguments) if self.guard is not None else None
+        return None if result is None else self._answer(result)
+
+    def _booked(self, result: dict, started: float, booking: dict = None, arguments: dict = None) -> dict:
+        """Emit a ``booking`` event with the result, the booking arguments and the call's duration."""
+        if self.events is not None:
+            self.events.emit("booking", {"tool": self.name, **({"booking": booking} if booking else {}), **result,
+                                         "seconds": time.perf_counter() - started})
+        if self.guard is not None:
+            self.guard.remember(self.name, arguments or booking, result)
+        return self._answer(result)
+
+
+# Hotel booking tool
+class BookHotelTool(BookingTool):
+    name: str = "book_hotel"
+    description: str = "Book a hotel reservation"
+
+    def _run(self, hotel_name: str, city: str, check_in_date: str, nights: int = 1) -> dict:
+        """Books a hotel for a stay.
+
+        Args:
+            hotel_name (str): The name of the hotel to book.
+            city (str): The city where the hotel is located.
+            check_in_date (str): The check-in date for the hotel stay.
+            nights (int): The number of nights for the hotel stay.
+
+        Returns:
+            dict: status and message.
+        """
+        booking = {"hotel_name": hotel_name, "city": city, "check_in_date": check_in_date, "nights": nights}
+        started = time.perf_counter()
+        return self._earlier_result(booking) or self._booked(get_booking_backend().book_hotel(
+            **booking, idempotency_key=booking_idempotency_key(self.name, booking)), started, booking)
+
+    async def _arun(self, hotel_name: str, city: str, check_in_date: str, nights: int = 1) -> dict:
+        """Async variant of ``_run`` that does not block the event loop while booking."""
+        booking = {"hotel_name": hotel_name, "city": city, "check_in_date": check_in_date, "nights": nights}
+        started = time.perf_counter()
+        return self._earlier_result(booking) or self._booked(await get_booking_backend().abook_hotel(
+            **booking, idempotency_key=booking_idempotency_key(self.name, booking)), started, booking)
+
+
+# Flight booking tool
+class BookFlightTool(BookingTool):
+    name: str = "book_flight"
+    description: str = "Book a flight reservation"
+
+    def _run(self, from_airport: str, to_airport: str, date: str = "next week") -> dict:
+        """Books a flight from one airport to another.
+
+        Args:
+            from_airport (str): The airport from which the flight departs.
+            to_airport (str): The airport to which the flight arrives.
+            date (str): The date of the flight.
+
+        Returns:
+            dict: status and message.
+        """
+        booking = {"from_airport": from_airport, "to_airport": to_airport, "date": date}
+        started = time.perf_counter()
+        return self._earlier_result(booking) or self._booked(get_booking_backend().book_flight(
+            **booking, idempotency_key=booking_idempotency_key(self.name, booking)), started, booking)
+
+    async def _arun(self, from_airport: str, to_airport: str, date: str = "next week") -> dict:
+        """Async variant of ``_run`` that does not block the event loop while booking."""
+        booking = {"from_airport": from_airport, "to_airport": to_airport, "date": date}
+        started = time.perf_counter()
+        return self._earlier_result(booking) or self._booked(await get_booking_backend().abook_flight(
+            **booking, idempotency_key=booking_idempotency_key(self.name, booking)), started, booking)
+
+
+class HotelReservation(BaseModel):
+    hotel_name: str = Field(description="The name of the hotel to book.")
+    city: str = Field(description="The city where the hotel is located.")
+    check_in_date: str = Field(description="The check-in date for the hotel stay.")
+    nights: int = Field(default=1, description="The number of nights for the hotel stay.")
+
+
+class FlightReservation(BaseModel):
+    from_airport: str = Field(description="The airport from which the flight departs.")
+    to_airport: str = Field(description="The airport to which the flight arrives.")
+    date: str = Field(default="next week", description="The date of the flight.")
+
+
+class BookHotelsInput(BaseModel):
+    reservations: list[HotelReservation] = Field(description="Every hotel stay to book, one entry per stay.")
+
+
+class BookFlightsInput(BaseModel):
+    reservations: list[FlightReservation] = Field(description="Every flight to book, one entry per leg.")
+
+
+def _batch_result(results: list) -> dict:
+    """Combine per-reservation results into one tool result that keeps each item's status."""
+    succeeded = sum(result["status"] == "success" for result in results)
+    status = "success" if succeeded == len(results) else "partial" if succeeded else "error"
+    return {
+        "status": status,
+        "results": [{"reservation": index + 1, **result} for index, result in enumerate(results)],
+        "message": " ".join(result["message"] for result in results),
+    }
+
+
+def _reservation_dicts(reservations: list) -> list:
+    return [reservation if isinstance(reservation, dict) else reservation.model_dump() for reservation in reservations]
+
+
+def _batch_idempotency_keys(tool_name: str, bookings: list) -> list:
+    # The position keeps two identical rooms in one group booking apart
+    return [booking_idempotency_key(tool_name, {**booking, "reservation": index})
+            for index, booking in enumerate(bookings)]
+
+
+# Batch hotel booking tool
+class BookHotelsTool(BookingTool):
+    name: str = "book_hotels"
+    description: str = ("Book two or more hotel reservations in a single call, e.g. every stay of a multi-city "
+                        "trip or several rooms for a group. Use this instead of calling book_hotel repeatedly.")
+    args_schema: type[BaseModel] = BookHotelsInput
+
+    def _run(self, reservations: list) -> dict:
+        """Books several hotel stays concurrently and returns the status of each one."""
+        bookings = _reservation_dicts(reservations)
+        started = time.perf_counter()
+        return self._earlier_result({"reservations": bookings}) or self._booked(_batch_result(
+            get_booking_backend().book_hotels(bookings, _batch_idempotency_keys(self.name, bookings))), started,
+            arguments={"reservations": bookings})
+
+    async def _arun(self, reservations: list) -> dict:
+        bookings = _reservation_dicts(reservations)
+        started = time.perf_counter()
+        return self._earlier_result({"reservations": bookings}) or self._booked(_batch_result(
+            await get_booking_backend().abook_hotels(bookings, _batch_idempotency_keys(self.name, bookings))), started,
+            arguments={"reservations": bookings})
+
+
+# Batch flight booking tool
+class BookFlightsTool(BookingTool):
+    name: str = "book_flights"
+    description: str = ("Book two or more flights in a single call, e.g. every leg of a multi-city or round trip. "
+                        "Use this instead of calling book_flight repeatedly.")
+    args_schema: type[BaseModel] = BookFlightsInput
+
+    def _run(self, reservations: list) -> dict:
+        """Books several flights concurrently and returns the status of each one."""
+        bookings = _reservation_dicts(reservations)
+        started = time.perf_counter()
+        return self._earlier_result({"reservations": bookings}) or self._booked(_batch_result(
+            get_booking_backend().book_flights(bookings, _batch_idempotency_keys(self.name, bookings))), started,
+            arguments={"reservations": bookings})
+
+    async def _arun(self, reservations: list) -> dict:
+        bookings = _reservation_dicts(reservations)
+        started = time.perf_counter()
+        return self._earlier_result({"reservations": bookings}) or self._booked(_batch_result(
+            await get_booking_backend().abook_flights(bookings, _batch_idempotency_keys(self.name, bookings))), started,
+            arguments={"reservations": bookings})
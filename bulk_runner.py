@@ -0,0 +1,236 @@
+"""Replay a JSONL request corpus through the travel agent across several processes.
+
+The corpus (see ``request_corpus``) is split round-robin into one shard per worker
+process. Each worker calls ``init`` once with warmed crews, then runs its shard
+with ``threads`` requests in flight. Results are appended to the output JSONL as
+they finish, one line per request:
+
+    {"id", "idempotency_key", "request", "status": "ok" | "error", "result" | "error",
+     "seconds", "worker", "llm_calls", "prompt_tokens", "completion_tokens"}
+
+Each request is booked with an idempotency key derived from the corpus path, its
+ID and its text, so retrying a request that was cut off mid-way does not book it
+twice, while the same ID in another corpus, or a line number that now holds
+another request, books anew. The output file is also the checkpoint, keyed the
+same way: a rerun skips the requests whose key is already recorded as ``ok`` and
+runs the rest. ``--max-rps`` caps the rate at which requests are started, split
+evenly between the workers. This also bounds the LLM request rate, because each
+request makes at most ``TRAVEL_AGENT_MAX_LLM_CALLS`` calls.
+
+Usage:
+    python bulk_runner.py CORPUS [--output results.jsonl] [--workers N] [--threads N]
+                                 [--max-rps R] [--warm-crews N] [--report report.json]
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+from request_corpus import iter_travel_requests
+
+# Seconds between checks for workers that died without finishing their shard
+_POLL_SECONDS = 1.0
+
+
+class RateLimiter:
+    """Token bucket that lets ``rate`` calls per second through, in bursts of at most ``burst``."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def completed_keys(output: Union[str, Path]) -> set:
+    """Idempotency keys of the requests an earlier run recorded as ``ok`` in ``output``."""
+    if not os.path.exists(output):
+        return set()
+    done = set()
+    with open(output, encoding="utf-8") as results:
+        for line in results:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a partial last line
+                continue
+            if record.get("status") == "ok" and "idempotency_key" in record:
+                done.add(record["idempotency_key"])
+    return done
+
+
+def idempotency_key(corpus: Union[str, Path], record: dict) -> str:
+    """Idempotency key for a corpus record, the same on every rerun of the corpus."""
+    payload = json.dumps([os.path.abspath(corpus), record["id"], record["request"]])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def shard(records: Iterable[dict], workers: int) -> list:
+    """Split ``records`` round-robin into ``workers`` lists."""
+    shards = [[] for _ in range(workers)]
+    for index, record in enumerate(records):
+        shards[index % workers].append(record)
+    return shards
+
+
+def run_record(record: dict, execute: Callable = None) -> dict:
+    """Run one corpus record and describe the outcome as an output line.
+
+    The record is booked under its ``idempotency_key``, or its ID when it has none.
+    """
+    if execute is None:
+        from crewai_travel_agent import execute_crewai_travel_request as execute
+    reports = []
+
+    def sink(event: str, data: dict):
+        if event == "report":
+            reports.append(data)
+
+    key = record.get("idempotency_key", record["id"])
+    outcome = {"id": record["id"], "idempotency_key": key, "request": record["request"], "worker": os.getpid()}
+    started = time.perf_counter()
+    try:
+        outcome.update(status="ok", result=str(execute(record["request"], idempotency_key=key, event_sink=sink)))
+    except Exception as error:
+        outcome.update(status="error", error=f"{type(error).__name__}: {error}")
+    outcome["seconds"] = time.perf_counter() - started
+    report = reports[-1] if reports else {}
+    for field in ("llm_calls", "prompt_tokens", "completion_tokens"):
+        outcome[field] = report.get(field, 0)
+    return outcome
+
+
+def _worker(records: list, results, threads: int, rate: Optional[float], warm_crews: int):
+    """Worker process: set up the agent once, run ``records`` and put each outcome on ``results``."""
+    try:
+        from crewai_travel_agent import TravelAgentConfig, init
+        init(TravelAgentConfig(warm_crews=warm_crews))
+        limiter = RateLimiter(rate) if rate else None
+
+        def run(record):
+            if limiter is not None:
+                limiter.acquire()
+            results.put(run_record(record))
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(run, records))
+    finally:
+        results.put(None)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+
+def summarize(outcomes: list, elapsed: float, skipped: int = 0) -> dict:
+    """Throughput, latency percentiles, error rate and LLM usage of a run."""
+    latencies = sorted(outcome["seconds"] for outcome in outcomes)
+    errors = [outcome for outcome in outcomes if outcome["status"] != "ok"]
+    return {
+        "requests": len(outcomes),
+        "skipped": skipped,
+        "errors": len(errors),
+        "error_rate": len(errors) / len(outcomes) if outcomes else 0.0,
+        "error_types": dict(Counter(outcome["error"].split(":", 1)[0] for outcome in errors)),
+        "elapsed_seconds": elapsed,
+        "requests_per_second": len(outcomes) / elapsed if elapsed > 0 else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "llm_calls": sum(outcome["llm_calls"] for outcome in outcomes),
+        "prompt_tokens": sum(outcome["prompt_tokens"] for outcome in outcomes),
+        "completion_tokens": sum(outcome["completion_tokens"] for outcome in outcomes),
+    }
+
+
+def run_corpus(corpus: Union[str, Path], output: Union[str, Path], workers: int = os.cpu_count() or 1,
+               threads: int = 4, max_rps: Optional[float] = None, warm_crews: int = 1) -> dict:
+    """Run every request of ``corpus`` whose idempotency key is not yet recorded as ``ok`` in ``output``,
+    and return the summary.
+
+    Requests of a worker that dies are left out of ``output``, so the next run picks them up.
+    """
+    done = completed_keys(output)
+    records = [dict(record, idempotency_key=idempotency_key(corpus, record)) for record in iter_travel_requests(corpus)]
+    pending = [record for record in records if record["idempotency_key"] not in done]
+    shards = [records for records in shard(pending, workers) if records]
+    rate = max_rps / len(shards) if max_rps and shards else None
+    # Workers start from a fresh interpreter rather than a fork of this process
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(records, results, threads, rate, warm_crews), daemon=True)
+                 for records in shards]
+    outcomes = []
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    with open(output, "a", encoding="utf-8") as out:
+        running = len(processes)
+        while running:
+            try:
+                outcome = results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if outcome is None:
+                running -= 1
+                continue
+            out.write(json.dumps(outcome) + "\n")
+            out.flush()
+            outcomes.append(outcome)
+    for process in processes:
+        process.join()
+    return summarize(outcomes, time.perf_counter() - started, skipped=len(records) - len(pending))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--output", default="results.jsonl", help="results, and the checkpoint for reruns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="requests in flight per worker")
+    parser.add_argument("--max-rps", type=float, default=None, help="requests started per second, in total")
+    parser.add_argument("--warm-crews", type=int, default=1, help="crews pre-built per task shape in each worker")
+    parser.add_argument("--report", default=None, help="also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    summary = run_corpus(args.corpus, args.output, args.workers, args.threads, args.max_rps, args.warm_crews)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            json.dump(summary, report, indent=2)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
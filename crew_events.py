@@ -0,0 +1,76 @@
+"""Progress events emitted while a crew runs, and their bridge to asyncio.
+
+Each pooled crew owns a ``CrewEvents`` relay shared by its tools and task
+callbacks. While a request runs, the relay forwards events to that request's
+sink. ``stream_events`` runs a blocking function in a worker thread and yields
+the events it emits as they happen, followed by its result.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Optional
+
+EventSink = Callable[[str, dict], None]
+
+
+class CrewEvents:
+    """Forwards events from a crew's tools and tasks to the current request's sink."""
+
+    def __init__(self):
+        self._sink: Optional[EventSink] = None
+        self._lock = threading.Lock()
+
+    def attach(self, sink: Optional[EventSink]) -> None:
+        with self._lock:
+            self._sink = sink
+
+    def emit(self, event: str, data: dict) -> None:
+        with self._lock:
+            sink = self._sink
+        if sink is not None:
+            sink(event, data)
+
+    def task_callback(self, task_name: str) -> Callable[[Any], None]:
+        """Callback for ``Task(callback=...)`` that emits a ``task`` event with the task's output."""
+        def callback(output):
+            self.emit("task", {"task": task_name, "output": str(getattr(output, "raw", output))})
+        return callback
+
+
+async def run_in_thread(executor: Optional[Executor], func: Callable, *args) -> Any:
+    """``asyncio.to_thread`` on ``executor``, or on the loop's default executor when it is None."""
+    loop = asyncio.get_running_loop()
+    # Like to_thread, run in a copy of the caller's context (trace and booking scopes)
+    return await loop.run_in_executor(executor, functools.partial(contextvars.copy_context().run, func, *args))
+
+
+async def stream_events(run: Callable[[EventSink], str], executor: Optional[Executor] = None) -> AsyncIterator[dict]:
+    """Run ``run(sink)`` in a worker thread and yield ``{"event", "data"}`` dicts as it emits them.
+
+    The thread comes from ``executor``, or the loop's default executor. The last
+    event is ``result`` with the return value, or ``error`` if ``run`` raised.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def sink(event: str, data: dict):
+        loop.call_soon_threadsafe(queue.put_nowait, {"event": event, "data": data})
+
+    worker = asyncio.ensure_future(run_in_thread(executor, run, sink))
+    worker.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield event
+        # Events emitted right before the worker finished are already queued ahead of the marker
+        try:
+            yield {"event": "result", "data": {"result": worker.result()}}
+        except Exception as error:
+            yield {"event": "error", "data": {"error": str(error)}}
+    finally:
+        if not worker.done():
+            worker.cancel()
@@ -0,0 +1,55 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterable
+
+
+class CrewPool:
+    """Pool of pre-built, reusable crews keyed by task shape.
+
+    A crew is handed to exactly one caller between ``checkout`` and ``checkin``, so
+    concurrent requests never share agents, tasks or memory handles. When no idle
+    crew of the requested shape is available a new one is built with ``factory``.
+    """
+
+    def __init__(self, factory: Callable[[Hashable], Any], max_idle_per_shape: int = 4):
+        self._factory = factory
+        self._max_idle_per_shape = max_idle_per_shape
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def checkout(self, shape: Hashable):
+        """Take an idle crew for ``shape`` out of the pool, building one if needed."""
+        with self._lock:
+            idle = self._idle[shape]
+            if idle:
+                return idle.pop()
+        return self._factory(shape)
+
+    def checkin(self, shape: Hashable, crew) -> None:
+        """Return a crew to the pool. Crews beyond the idle limit are dropped."""
+        with self._lock:
+            idle = self._idle[shape]
+            if len(idle) < self._max_idle_per_shape:
+                idle.append(crew)
+
+    @contextmanager
+    def crew(self, shape: Hashable):
+        """Check out a crew for the duration of a ``with`` block.
+
+        The crew is only returned to the pool when the block succeeds, since a
+        failed kickoff may leave it half-way through its tasks.
+        """
+        crew = self.checkout(shape)
+        yield crew
+        self.checkin(shape, crew)
+
+    def warm(self, shapes: Iterable[Hashable], count: int = 1) -> None:
+        """Pre-build ``count`` idle crews for each shape."""
+        for shape in shapes:
+            for _ in range(count):
+                self.checkin(shape, self._factory(shape))
+
+    def idle_count(self, shape: Hashable) -> int:
+        with self._lock:
+            return len(self._idle[shape])
@@ -0,0 +1,33 @@
+"""CrewAI task that runs asynchronously executed tasks safely.
+
+CrewAI 0.95 runs an ``async_execution`` task in a bare thread:
+
+- The thread starts with an empty ``contextvars`` context, so the request's
+  booking idempotency scope (and its trace context) would be lost. ``TravelTask``
+  runs the thread in a copy of the caller's context.
+- It never resolves the task's future when the task raises, so the crew waits for
+  it forever. ``TravelTask`` hands the exception to the future instead, and
+  ``kickoff`` raises it.
+"""
+import contextvars
+import threading
+from concurrent.futures import Future
+
+from crewai import Task
+
+
+class TravelTask(Task):
+    def execute_async(self, agent=None, context=None, tools=None) -> Future:
+        future = Future()
+        threading.Thread(
+            daemon=True,
+            target=contextvars.copy_context().run,
+            args=(self._execute_task_async, agent, context, tools, future),
+        ).start()
+        return future
+
+    def _execute_task_async(self, agent, context, tools, future: Future) -> None:
+        try:
+            future.set_result(self._execute_core(agent, context, tools))
+        except Exception as error:
+            future.set_exception(error)
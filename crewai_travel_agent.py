@@ -1,81 +1,216 @@
+import asyncio
+import importlib
 import logging
+import os
+import threading
 import time
-from crewai import Agent, Crew, Task
-from crewai.tools import BaseTool
 import uuid
-from langchain_openai import ChatOpenAI
+from dataclasses import dataclass
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from monocle_apptrace.instrumentation.common.scope_wrapper import monocle_trace_scope
-from monocle_apptrace.instrumentation import setup_monocle_telemetry
-    # Setup monocle telemetry
-setup_monocle_telemetry(workflow_name="okahu_demos_crewai_travel_agent", monocle_exporters_list = 'file,okahu')
+# crewai, langchain and monocle take seconds to import; they are loaded on first use
+from booking_backends import HttpBookingBackend, booking_scope, set_booking_backend
+from crew_events import CrewEvents, EventSink, run_in_thread, stream_events
+from crew_pool import CrewPool
+from execution_policy import AgentGuard, RequestBudget
+from llm_clients import create_agent_llm, create_llm, enable_llm_cache
+from prompt_budget import fit_request, task_prompt_tokens
+from request_metrics import RequestReport
+from response_cache import ResponseCache, cache_key
+from session_memory import SessionState, SessionStore
+from travel_router import FLIGHT_SERVICE, HOTEL_SERVICE, TravelIntent, route_travel_request
+
+if TYPE_CHECKING:
+    from crewai import Crew
+    from telemetry import TelemetrySettings
 
 logging.basicConfig(level=logging.WARN)
+logger = logging.getLogger(__name__)
+
+# Task shapes the crew pool is keyed by
+COMMON_TASK_SHAPES = [(HOTEL_SERVICE,), (FLIGHT_SERVICE,), (HOTEL_SERVICE, FLIGHT_SERVICE)]
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Run the hotel and flight tasks concurrently when a request needs both
+PARALLEL_SPECIALIST_TASKS = _env_flag("TRAVEL_AGENT_PARALLEL_TASKS", True)
+
+# Add the supervisor task even when the request needs a single specialist
+ALWAYS_RUN_SUPERVISOR = _env_flag("TRAVEL_AGENT_ALWAYS_SUPERVISE", False)
+
+# Book straight through the tools, without any agent, when the router filled every slot
+DIRECT_TOOL_CALLS = _env_flag("TRAVEL_AGENT_DIRECT_TOOL_CALLS", False)
+
+# Return the stored confirmation for repeated requests instead of booking again (opt-in)
+RESPONSE_CACHE = _env_flag("TRAVEL_AGENT_RESPONSE_CACHE", False)
+RESPONSE_CACHE_SIZE = int(os.environ.get("TRAVEL_AGENT_RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.environ.get("TRAVEL_AGENT_RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_DB = os.environ.get("TRAVEL_AGENT_RESPONSE_CACHE_DB")
+
+# Model and connection pool shared by all agents; completion caching is opt-in
+LLM_MODEL = os.environ.get("TRAVEL_AGENT_LLM_MODEL", "gpt-4o-mini")
+LLM_MAX_CONNECTIONS = int(os.environ.get("TRAVEL_AGENT_LLM_MAX_CONNECTIONS", "20"))
+LLM_CACHE = _env_flag("TRAVEL_AGENT_LLM_CACHE", False)
+LLM_CACHE_SIZE = int(os.environ.get("TRAVEL_AGENT_LLM_CACHE_SIZE", "1000"))
+
+# Model per agent tier: an OpenAI model name, a litellm provider/model string (e.g. ollama/llama3.1
+# for a local model) or "mock". A specialist whose tool call fails switches to the escalation model
+# for the rest of the request; there is no escalation while it is the specialist model
+SPECIALIST_MODEL = os.environ.get("TRAVEL_AGENT_SPECIALIST_MODEL", LLM_MODEL)
+SUPERVISOR_MODEL = os.environ.get("TRAVEL_AGENT_SUPERVISOR_MODEL", LLM_MODEL)
+ESCALATION_MODEL = os.environ.get("TRAVEL_AGENT_ESCALATION_MODEL", SUPERVISOR_MODEL)
+
+# Offline mode: scripted stand-in LLM for every tier, with simulated latency, and no crew
+# memory (memory embeddings would call the OpenAI API)
+MOCK_LLM = _env_flag("TRAVEL_AGENT_MOCK_LLM", False)
+MOCK_LLM_LATENCY = os.environ.get("TRAVEL_AGENT_MOCK_LLM_LATENCY", "none")
+
+# Booking service behind the tools; without a URL bookings are simulated in-process
+BOOKING_SERVICE_URL = os.environ.get("TRAVEL_AGENT_BOOKING_SERVICE_URL")
+BOOKING_TIMEOUT = float(os.environ.get("TRAVEL_AGENT_BOOKING_TIMEOUT", "5"))
+BOOKING_MAX_RETRIES = int(os.environ.get("TRAVEL_AGENT_BOOKING_MAX_RETRIES", "3"))
+
+# Booking state remembered across the turns of a session, so follow-ups only state what changes
+SESSION_MEMORY = _env_flag("TRAVEL_AGENT_SESSION_MEMORY", True)
+SESSION_MEMORY_SIZE = int(os.environ.get("TRAVEL_AGENT_SESSION_MEMORY_SIZE", "10000"))
+SESSION_MEMORY_TTL = float(os.environ.get("TRAVEL_AGENT_SESSION_MEMORY_TTL", "86400"))
+SESSION_MEMORY_DB = os.environ.get("TRAVEL_AGENT_SESSION_MEMORY_DB")
+
+# Token budget for the request text placed in each task prompt; longer requests are trimmed
+MAX_REQUEST_TOKENS = int(os.environ.get("TRAVEL_AGENT_MAX_REQUEST_TOKENS", "256"))
+
+# LLM iterations a specialist agent may take; the supervisor gets one more than the services it coordinates
+SPECIALIST_MAX_ITER = int(os.environ.get("TRAVEL_AGENT_SPECIALIST_MAX_ITER", "3"))
+
+# LLM calls and seconds one request may spend before it is stopped; 0 disables the limit
+MAX_LLM_CALLS = int(os.environ.get("TRAVEL_AGENT_MAX_LLM_CALLS", "15"))
+REQUEST_TIMEOUT = float(os.environ.get("TRAVEL_AGENT_REQUEST_TIMEOUT", "120"))
+
+# End a specialist's task with its booking tool's result as soon as the booking succeeds (opt-in)
+STOP_ON_SUCCESS = _env_flag("TRAVEL_AGENT_STOP_ON_SUCCESS", False)
+
+# Upper bound on travel requests running at once in execute_crewai_travel_requests_async
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("TRAVEL_AGENT_MAX_CONCURRENCY", "4"))
+
+# Monocle telemetry, set up by init() on first use rather than at import
+TELEMETRY = _env_flag("TRAVEL_AGENT_TELEMETRY", True)
+MONOCLE_EXPORTERS = os.environ.get("TRAVEL_AGENT_MONOCLE_EXPORTERS", "file,okahu")
+
+if BOOKING_SERVICE_URL:
+    set_booking_backend(HttpBookingBackend(BOOKING_SERVICE_URL, BOOKING_TIMEOUT, BOOKING_MAX_RETRIES))
+
+# Names served from modules that are only imported when first accessed
+_LAZY_ATTRIBUTES = {
+    "BookingTool": "booking_tools",
+    "BookHotelTool": "booking_tools",
+    "BookFlightTool": "booking_tools",
+    "BookHotelsTool": "booking_tools",
+    "BookFlightsTool": "booking_tools",
+    "HotelReservation": "booking_tools",
+    "FlightReservation": "booking_tools",
+    "monocle_trace_scope": "monocle_apptrace.instrumentation.common.scope_wrapper",
+    "flush_telemetry": "telemetry",
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+
+@dataclass
+class TravelAgentConfig:
+    """Process-wide setup applied once by ``init``."""
+    telemetry: bool = TELEMETRY
+    workflow_name: str = "okahu_demos_crewai_travel_agent"
+    monocle_exporters: str = MONOCLE_EXPORTERS
+    # Sampling and export settings; None reads the TRAVEL_AGENT_TELEMETRY_MODE/TRACE_* variables
+    telemetry_settings: Optional["TelemetrySettings"] = None
+    llm_cache: bool = LLM_CACHE
+    # Import crewai and the booking tools now instead of on the first request
+    preload: bool = True
+    # Crews to pre-build per common task shape
+    warm_crews: int = 0
+
+_init_lock = threading.Lock()
+_active_config: Optional[TravelAgentConfig] = None
+
+def init(config: TravelAgentConfig = None) -> TravelAgentConfig:
+    """Set up Monocle telemetry and the LLM completion cache, load crewai, and optionally warm the crew pool.
+
+    Runs once per process; later calls return the active configuration and change
+    nothing. The request functions call it themselves, so calling it explicitly only
+    moves the setup cost to startup or picks a different configuration.
+    """
+    global _active_config
+    with _init_lock:
+        if _active_config is not None:
+            return _active_config
+        config = config or TravelAgentConfig()
+        if config.telemetry:
+            from telemetry import setup_telemetry
+            setup_telemetry(config.workflow_name, config.monocle_exporters, config.telemetry_settings)
+        if config.llm_cache:
+            enable_llm_cache(LLM_CACHE_SIZE)
+        if config.preload:
+            importlib.import_module("booking_tools")
+        _active_config = config
+    if config.warm_crews:
+        warm_crew_pool(config.warm_crews)
+    return config
+
+def _agent_llm(tool_choice: str, model: str = LLM_MODEL):
+    if MOCK_LLM or model == "mock":
+        from mock_llm import MockLLM
+        return MockLLM(MOCK_LLM_LATENCY)
+    return create_llm(model, tool_choice, LLM_MAX_CONNECTIONS)
+
+def _escalation_llm():
+    """The model a specialist escalates to, or None when that would be its own model."""
+    if ESCALATION_MODEL == SPECIALIST_MODEL:
+        return None
+    if MOCK_LLM or ESCALATION_MODEL == "mock":
+        from mock_llm import MockLLM
+        return MockLLM(MOCK_LLM_LATENCY, model="mock/escalation")
+    return create_agent_llm(ESCALATION_MODEL, LLM_MAX_CONNECTIONS)
+
+def create_agents(events: CrewEvents = None, guard: AgentGuard = None, services: int = 2):
+    """Create CrewAI agents. Only call this when OpenAI API key is available (or in mock LLM mode).
+
+    Every call returns new agents with their own tool instances, so agents built
+    for one crew never share mutable state with another crew. The tools report
+    their bookings to ``events``, and ``guard`` enforces each request's budget on
+    the agents and deduplicates their bookings. The supervisor may take one LLM
+    iteration per service it coordinates, to book what a specialist missed, plus
+    one for its summary.
+    Specialists run on ``SPECIALIST_MODEL`` and, after a failed tool call, on
+    ``ESCALATION_MODEL``; the supervisor writes its summary with ``SUPERVISOR_MODEL``.
+    """
+    from crewai import Agent
+    from booking_tools import BookFlightsTool, BookFlightTool, BookHotelsTool, BookHotelTool
+
+    specialist_tools = dict(events=events, guard=guard, answer_on_success=STOP_ON_SUCCESS)
+    hotel_tool = BookHotelTool(**specialist_tools)
+    flight_tool = BookFlightTool(**specialist_tools)
+    hotels_tool = BookHotelsTool(**specialist_tools)
+    flights_tool = BookFlightsTool(**specialist_tools)
 
-# Hotel booking tool
-class BookHotelTool(BaseTool):
-    name: str = "book_hotel"
-    description: str = "Book a hotel reservation"
-
-    def _run(self, hotel_name: str, city: str, check_in_date: str, nights: int = 1) -> dict:
-        """Books a hotel for a stay.
-
-        Args:
-            hotel_name (str): The name of the hotel to book.
-            city (str): The city where the hotel is located.
-            check_in_date (str): The check-in date for the hotel stay.
-            nights (int): The number of nights for the hotel stay.
-
-        Returns:
-            dict: status and message.
-        """
-        time.sleep(0.1)  # Simulate processing time
-        return {
-            "status": "success",
-            "message": f"Successfully booked a stay at {hotel_name} in {city} from {check_in_date} for {nights} nights."
-        }
-
-
-# Flight booking tool
-class BookFlightTool(BaseTool):
-    name: str = "book_flight"
-    description: str = "Book a flight reservation"
-
-    def _run(self, from_airport: str, to_airport: str, date: str = "next week") -> dict:
-        """Books a flight from one airport to another.
-
-        Args:
-            from_airport (str): The airport from which the flight departs.
-            to_airport (str): The airport to which the flight arrives.
-            date (str): The date of the flight.
-
-        Returns:
-            dict: status and message.
-        """
-        time.sleep(0.1)  # Simulate processing time
-        return {
-            "status": "success",
-            "message": f"Flight booked from {from_airport} to {to_airport} for {date}."
-        }
-
-
-# Create tools
-hotel_tool = BookHotelTool()
-flight_tool = BookFlightTool()
-
-def create_agents():
-    """Create CrewAI agents. Only call this when OpenAI API key is available."""
     # Create hotel booking agent
     hotel_booking_agent = Agent(
         role="Hotel Booking Agent",
         goal="Book the best hotel accommodations for travelers",
-        backstory="You are an expert hotel booking specialist. When specific details like check-in dates or number of nights are not provided, make reasonable assumptions based on context. For example, if a flight date is mentioned, assume hotel check-in on the same date and 1 night stay by default. You MUST use the book_hotel tool to complete any hotel booking.",
-        tools=[hotel_tool],
-        llm=ChatOpenAI(model="gpt-4o-mini", tool_choice="required"),
+        backstory="You are an expert hotel booking specialist. When specific details like check-in dates or number of nights are not provided, make reasonable assumptions based on context. For example, if a flight date is mentioned, assume hotel check-in on the same date and 1 night stay by default. You MUST use the book_hotel tool to complete any hotel booking. When the request has more than one hotel stay, book them all with a single book_hotels call.",
+        tools=[hotel_tool, hotels_tool],
+        llm=_agent_llm("required", SPECIALIST_MODEL),
         verbose=False,
         allow_delegation=False,
-        max_iter=5,
+        max_iter=SPECIALIST_MAX_ITER,
         step_callback=None,
+        cache=False,
         memory = True
     )
 
@@ -83,13 +218,14 @@ def create_agents():
     flight_booking_agent = Agent(
         role="Flight Booking Agent", 
         goal="Book the best flight options for travelers",
-        backstory="You are an expert flight booking specialist. When dates like 'next week' are mentioned, make reasonable assumptions (e.g., 7 days from today). Always proceed with booking using your best judgment. You MUST use the book_flight tool to complete any flight booking.",
-        tools=[flight_tool],
-        llm=ChatOpenAI(model="gpt-4o-mini", tool_choice="required"),
+        backstory="You are an expert flight booking specialist. When dates like 'next week' are mentioned, make reasonable assumptions (e.g., 7 days from today). Always proceed with booking using your best judgment. You MUST use the book_flight tool to complete any flight booking. When the request has more than one flight leg, book them all with a single book_flights call.",
+        tools=[flight_tool, flights_tool],
+        llm=_agent_llm("required", SPECIALIST_MODEL),
         verbose=False,
         allow_delegation=False,
-        max_iter=5,
+        max_iter=SPECIALIST_MAX_ITER,
         step_callback=None,
+        cache=False,
         memory = True
     )
 
@@ -98,62 +234,112 @@ def create_agents():
         role="Supervisor Travel Agent",
         goal="Coordinate complete travel bookings by directly using specialist tools",
         backstory="You are a travel supervisor who can directly book hotels and flights. Make reasonable assumptions when details are missing and proceed with bookings.",
-        tools=[hotel_tool, flight_tool],  # Give supervisor direct access to tools
-        llm=ChatOpenAI(model="gpt-4o-mini", tool_choice="auto"),
+        # Give supervisor direct access to tools; its own instances never end its task early
+        tools=[BookHotelTool(events=events, guard=guard), BookFlightTool(events=events, guard=guard)],
+        llm=_agent_llm("auto", SUPERVISOR_MODEL),
         verbose=False,
         allow_delegation=False,  # Disable delegation to avoid validation errors,
-        max_iter=5,
+        max_iter=services + 1,
         step_callback=None,
+        cache=False,
         memory = True
     )
-    
-    return hotel_booking_agent, flight_booking_agent, supervisor_agent
 
-# Initialize agents only when imported by tests (not when run directly)
-hotel_booking_agent = None
-flight_booking_agent = None 
-supervisor_agent = None
+    if guard is not None:
+        for agent in (hotel_booking_agent, flight_booking_agent):
+            guard.watch(agent, _escalation_llm())
+        guard.watch(supervisor_agent)
+    return hotel_booking_agent, flight_booking_agent, supervisor_agent
 
 def generate_session_id():
     return str(uuid.uuid4())
 
-def create_crewai_travel_crew(travel_request: str):
-    """Create a CrewAI crew for travel booking based on the request."""
-    global hotel_booking_agent, flight_booking_agent, supervisor_agent
-    # Initialize agents if not already done
-    if hotel_booking_agent is None:
-        hotel_booking_agent, flight_booking_agent, supervisor_agent = create_agents()
-    # Create tasks based on the request
+def _describe_slots(slots) -> str:
+    if slots is None:
+        return "none"
+    return ", ".join(f"{name}={value if value else 'not given'}" for name, value in slots.as_tool_args().items())
+
+def crew_inputs(travel_request: str, intent: TravelIntent, session: SessionState = None) -> dict:
+    """Kickoff inputs for a pooled crew: the request fitted to ``MAX_REQUEST_TOKENS``, the
+    pre-extracted tool arguments and, for a follow-up turn, what it changes in the
+    session's earlier bookings. Every task shares the same fitted request text."""
+    session = session or SessionState()
+    return {
+        "travel_request": fit_request(travel_request, MAX_REQUEST_TOKENS),
+        "hotel_slots": _describe_slots(intent.hotel_slots),
+        "flight_slots": _describe_slots(intent.flight_slots),
+        "hotel_history": session.describe(HOTEL_SERVICE, intent.hotel_slots),
+        "flight_history": session.describe(FLIGHT_SERVICE, intent.flight_slots),
+    }
+
+@dataclass
+class TravelCrew:
+    """A pooled crew together with the event relay its tools and tasks report to, and its agents' guard."""
+    crew: "Crew"
+    events: CrewEvents
+    guard: AgentGuard
+
+def build_crewai_travel_crew(shape: tuple) -> TravelCrew:
+    """Build a reusable crew for a task shape.
+
+    Task descriptions keep ``{travel_request}`` and slot placeholders that CrewAI fills
+    in from the ``crew_inputs`` kickoff inputs, so the same crew can serve any request
+    of this shape.
+    With ``PARALLEL_SPECIALIST_TASKS`` the hotel and flight tasks of a combined
+    request run as async tasks and the supervisor task waits for both.
+    A request for a single service skips the supervisor and returns the specialist's
+    confirmation directly, unless ``ALWAYS_RUN_SUPERVISOR`` is set.
+    CrewAI's tool cache is off for the crew and each of its agents: it would outlive
+    the request on a pooled crew and answer a later traveler's identical booking
+    without booking it. The crew's ``AgentGuard`` deduplicates tool calls within a
+    request instead.
+    """
+    from crewai import Crew
+    from crew_tasks import TravelTask
+
+    events = CrewEvents()
+    guard = AgentGuard(events)
+    hotel_booking_agent, flight_booking_agent, supervisor_agent = create_agents(events, guard, len(shape))
     tasks = []
-    
-    # Check if hotel booking is needed
-    if any(keyword in travel_request.lower() for keyword in ['hotel', 'stay', 'accommodation', 'room']):
-        hotel_task = Task(
+    run_in_parallel = PARALLEL_SPECIALIST_TASKS and len(shape) > 1
+
+    if HOTEL_SERVICE in shape:
+        hotel_task = TravelTask(
             name="Hotel Booking Task",
-            description=f"Extract hotel booking details from this request and book accordingly: {travel_request}",
+            description="Extract hotel booking details from this request and book accordingly: {travel_request}\n"
+                        "Arguments already extracted for book_hotel (use them as given, only work out the ones not given): {hotel_slots}\n"
+                        "Earlier in this session: {hotel_history}",
             expected_output="Hotel booking confirmation with details",
-            agent=hotel_booking_agent
+            agent=hotel_booking_agent,
+            async_execution=run_in_parallel,
+            callback=events.task_callback("Hotel Booking Task")
         )
         tasks.append(hotel_task)
-    
-    # Check if flight booking is needed
-    if any(keyword in travel_request.lower() for keyword in ['flight', 'fly', 'travel', 'airport']):
-        flight_task = Task(
+
+    if FLIGHT_SERVICE in shape:
+        flight_task = TravelTask(
             name="Flight Booking Task",
-            description=f"Extract flight booking details from this request and book accordingly: {travel_request}",
+            description="Extract flight booking details from this request and book accordingly: {travel_request}\n"
+                        "Arguments already extracted for book_flight (use them as given, only work out the ones not given): {flight_slots}\n"
+                        "Earlier in this session: {flight_history}",
             expected_output="Flight booking confirmation with details",
-            agent=flight_booking_agent
+            agent=flight_booking_agent,
+            async_execution=run_in_parallel,
+            callback=events.task_callback("Flight Booking Task")
         )
         tasks.append(flight_task)
-    
-    # Add supervisor task to coordinate
-    supervisor_task = Task(
-        name="Travel Coordination Task",
-        description=f"Coordinate and summarize the complete travel booking for: {travel_request}. Ensure all requested services are booked and provide a comprehensive summary.",
-        expected_output="Complete travel booking summary with all confirmations",
-        agent=supervisor_agent
-    )
-    tasks.append(supervisor_task)
+
+    # Add supervisor task to coordinate; a lone specialist already produces the confirmation
+    if len(shape) != 1 or ALWAYS_RUN_SUPERVISOR:
+        supervisor_task = TravelTask(
+            name="Travel Coordination Task",
+            description="Coordinate and summarize the complete travel booking for: {travel_request}. Ensure all requested services are booked and provide a comprehensive summary.",
+            expected_output="Complete travel booking summary with all confirmations",
+            agent=supervisor_agent,
+            context=list(tasks),
+            callback=events.task_callback("Travel Coordination Task")
+        )
+        tasks.append(supervisor_task)
 
     # Create crew
     crew = Crew(
@@ -161,28 +347,270 @@ def create_crewai_travel_crew(travel_request: str):
         tasks=tasks,
         verbose=True,
         process="sequential",
-        memory=True
+        memory=not MOCK_LLM,
+        cache=False
     )
+    return TravelCrew(crew, events, guard)
+
+# Pre-built crews are reused across requests instead of being rebuilt every turn
+crew_pool = CrewPool(build_crewai_travel_crew, max_idle_per_shape=MAX_CONCURRENT_REQUESTS)
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_DB) if RESPONSE_CACHE else None
+
+session_store = (SessionStore(SESSION_MEMORY_SIZE, SESSION_MEMORY_TTL, SESSION_MEMORY_DB)
+                 if SESSION_MEMORY else None)
+
+def warm_crew_pool(count: int = 1):
+    """Pre-build crews for the common task shapes. Requires the OpenAI API key."""
+    init()
+    crew_pool.warm(COMMON_TASK_SHAPES, count)
+
+def create_crewai_travel_crew(travel_request: str):
+    """Create a CrewAI crew for travel booking based on the request.
+
+    The crew is taken from the pool and owned by the caller; its task descriptions
+    are already filled in, so it can be kicked off with or without inputs.
+    """
+    init()
+    intent = route_travel_request(travel_request).or_all_services()
+    crew = crew_pool.checkout(intent.services).crew
+    inputs = crew_inputs(travel_request, intent)
+    for task in crew.tasks:
+        task.interpolate_inputs(inputs)
+        # kickoff(inputs=...) re-templates from the originals; the filled-in text leaves it nothing to fill
+        task._original_description = task.description.replace("{", "{{").replace("}", "}}")
+        task._original_expected_output = task.expected_output
     return crew
 
-def execute_crewai_travel_request(travel_request: str):
-    """Execute a travel request using CrewAI and return the result."""
-    crew = create_crewai_travel_crew(travel_request)
-    result = crew.kickoff(inputs={
-        "travel_request": travel_request
-    })
-    return str(result)
+def _require_complete_slots(intent: TravelIntent):
+    if not intent.has_complete_slots():
+        raise ValueError("direct booking needs an intent with complete booking slots")
+
+def book_with_tools(intent: TravelIntent, events: CrewEvents = None) -> str:
+    """Book every service in a fully extracted intent by calling the tools directly.
+
+    This skips the agent loop entirely, so it makes no LLM calls. An intent without
+    complete slots raises ``ValueError``.
+    """
+    from booking_tools import BookFlightTool, BookHotelTool
+
+    _require_complete_slots(intent)
+    results = []
+    if intent.hotel_slots is not None:
+        results.append(BookHotelTool(events=events).run(**intent.hotel_slots.as_tool_args()))
+    if intent.flight_slots is not None:
+        results.append(BookFlightTool(events=events).run(**intent.flight_slots.as_tool_args()))
+    return "\n".join(result["message"] for result in results)
+
+async def abook_with_tools(intent: TravelIntent, events: CrewEvents = None) -> str:
+    """Async ``book_with_tools``: the hotel and flight bookings run concurrently on the event loop."""
+    from booking_tools import BookFlightTool, BookHotelTool
+
+    _require_complete_slots(intent)
+    bookings = []
+    if intent.hotel_slots is not None:
+        bookings.append(BookHotelTool(events=events)._arun(**intent.hotel_slots.as_tool_args()))
+    if intent.flight_slots is not None:
+        bookings.append(BookFlightTool(events=events)._arun(**intent.flight_slots.as_tool_args()))
+    results = await asyncio.gather(*bookings)
+    return "\n".join(result["message"] for result in results)
 
-async def execute_crewai_travel_request_async(travel_request: str):
-    """Execute a travel request using CrewAI asynchronously and return the result."""
-    crew = create_crewai_travel_crew(travel_request)
-    result = crew.kickoff(inputs={
-        "travel_request": travel_request
-    })
+def _session_turn(travel_request: str, session_id: str = None) -> tuple:
+    """Route a request and complete it from the session's earlier bookings.
+
+    Returns ``(intent, session state)``; the state is ``None`` without a session. A
+    request that names no service, and is no follow-up, goes to every service.
+    """
+    intent = route_travel_request(travel_request)
+    if session_id is None or session_store is None:
+        return intent.or_all_services(), None
+    session = session_store.get(session_id)
+    return session.apply(intent).or_all_services(), session
+
+def _remember_turn(session_id: str, session: SessionState, intent: TravelIntent, bookings: list):
+    if session is not None:
+        session_store.put(session_id, session.record(intent, bookings))
+
+def _request_sink(report: RequestReport, bookings: list, event_sink: EventSink = None) -> EventSink:
+    """Event sink that records booking and escalation events on the report and bookings on the bookings
+    list, then forwards them."""
+    def sink(event: str, data: dict):
+        if event == "booking":
+            bookings.append(data)
+            report.record_tool(data["tool"], data["seconds"], data.get("status", "unknown"))
+        elif event == "escalation":
+            report.record_escalation(data["agent"], data["model"])
+        if event_sink is not None:
+            event_sink(event, data)
+    return sink
+
+def request_budget() -> RequestBudget:
+    """A fresh budget of ``MAX_LLM_CALLS`` LLM calls and ``REQUEST_TIMEOUT`` seconds."""
+    return RequestBudget(MAX_LLM_CALLS or None, REQUEST_TIMEOUT or None)
+
+def _finish_report(report: RequestReport, sink: EventSink):
+    report.finish()
+    logger.debug("Travel request report: %s", report.as_dict())
+    sink("report", report.as_dict())
+
+def _run_travel_request(travel_request: str, intent: TravelIntent, event_sink: EventSink = None,
+                        session: SessionState = None, report: RequestReport = None,
+                        budget: RequestBudget = None) -> str:
+    report = report or RequestReport()
+    if DIRECT_TOOL_CALLS and intent.has_complete_slots():
+        events = CrewEvents()
+        events.attach(event_sink)
+        with report.stage("direct_booking"):
+            return book_with_tools(intent, events)
+    checkout_started = time.perf_counter()
+    with crew_pool.crew(intent.services) as travel_crew:
+        # Includes building the agents and tasks when no idle crew of this shape is pooled
+        report.record_stage("crew_checkout", time.perf_counter() - checkout_started)
+        crew = travel_crew.crew
+        travel_crew.events.attach(event_sink)
+        travel_crew.guard.start(budget)
+        try:
+            # Pooled agents keep counting tokens across requests, so this request's usage is the difference
+            usage_before = crew.calculate_usage_metrics()
+            with report.stage("kickoff"):
+                result = crew.kickoff(inputs=crew_inputs(travel_request, intent, session))
+            usage = crew.calculate_usage_metrics()
+            report.record_usage(usage.successful_requests - usage_before.successful_requests,
+                                usage.prompt_tokens - usage_before.prompt_tokens,
+                                usage.completion_tokens - usage_before.completion_tokens)
+            for task in crew.tasks:
+                report.record_task(task.name, task.execution_duration)
+            report.estimated_prompt_tokens = task_prompt_tokens(crew.tasks)
+        finally:
+            travel_crew.events.attach(None)
+            travel_crew.guard.stop()
     return str(result)
 
+def execute_crewai_travel_request(travel_request: str, idempotency_key: str = None, event_sink: EventSink = None,
+                                  session_id: str = None):
+    """Execute a travel request using CrewAI and return the result.
+
+    With the response cache enabled and an ``idempotency_key`` (for example the
+    session ID), a repeat of an earlier request with the same key returns the
+    earlier confirmation and books nothing. Requests without a key are never
+    answered from the cache, so identical requests from different travelers are
+    booked separately. The same key scopes the booking service's idempotency keys, so a
+    retried request does not book twice. ``event_sink(event, data)`` is called with
+    ``booking``, ``task`` and ``escalation`` progress events while the request runs,
+    and with a ``report`` event (a ``RequestReport`` as a dict) at the end.
+    With ``session_id`` the request is a turn of that session: details it leaves out
+    come from the session's earlier bookings, and its bookings are remembered.
+    A request that spends ``MAX_LLM_CALLS`` or ``REQUEST_TIMEOUT`` raises
+    ``RequestBudgetExceeded``.
+    """
+    init()
+    report = RequestReport()
+    with report.stage("route"):
+        intent, session = _session_turn(travel_request, session_id)
+    return _execute_routed_request(travel_request, intent, session, report, idempotency_key, event_sink, session_id)
+
+def _execute_routed_request(travel_request: str, intent: TravelIntent, session: Optional[SessionState],
+                            report: RequestReport, idempotency_key: str = None, event_sink: EventSink = None,
+                            session_id: str = None) -> str:
+    """``execute_crewai_travel_request`` for a request already routed to ``intent`` on ``report``."""
+    budget = request_budget()
+    bookings = []
+    sink = _request_sink(report, bookings, event_sink)
+    try:
+        with booking_scope(idempotency_key or generate_session_id()):
+            if response_cache is None or idempotency_key is None:
+                result = _run_travel_request(travel_request, intent, sink, session, report, budget)
+            else:
+                result = response_cache.get_or_compute(
+                    cache_key(travel_request, intent, idempotency_key),
+                    lambda: _run_travel_request(travel_request, intent, sink, session, report, budget))
+        _remember_turn(session_id, session, intent, bookings)
+    finally:
+        _finish_report(report, sink)
+    return result
+
+async def execute_crewai_travel_request_async(travel_request: str, idempotency_key: str = None,
+                                              session_id: str = None, executor: Executor = None):
+    """Execute a travel request using CrewAI asynchronously and return the result.
+
+    Crew construction and ``kickoff`` are blocking, so the whole request runs in a
+    worker thread, from ``executor`` or else the loop's default executor, and the
+    event loop stays free to serve other travelers. Requests taking the tool-direct
+    path (and not the response cache) book on the event loop. A request is routed
+    once, and the session store is only read and written on a worker thread.
+    """
+    if _active_config is None:
+        await asyncio.to_thread(init)
+    if not DIRECT_TOOL_CALLS or (response_cache is not None and idempotency_key is not None):
+        return await run_in_thread(executor, execute_crewai_travel_request, travel_request, idempotency_key, None,
+                                   session_id)
+    report = RequestReport()
+    with report.stage("route"):
+        if session_id is None or session_store is None:
+            intent, session = _session_turn(travel_request)
+        else:
+            intent, session = await run_in_thread(executor, _session_turn, travel_request, session_id)
+    if not intent.has_complete_slots():
+        return await run_in_thread(executor, _execute_routed_request, travel_request, intent, session, report,
+                                   idempotency_key, None, session_id)
+    bookings = []
+    events = CrewEvents()
+    events.attach(_request_sink(report, bookings))
+    try:
+        with booking_scope(idempotency_key or generate_session_id()), report.stage("direct_booking"):
+            result = await abook_with_tools(intent, events)
+        if session is not None:
+            await run_in_thread(executor, _remember_turn, session_id, session, intent, bookings)
+    finally:
+        _finish_report(report, events.emit)
+    return result
+
+async def stream_crewai_travel_request(travel_request: str, idempotency_key: str = None, session_id: str = None,
+                                       executor: Executor = None) -> AsyncIterator[dict]:
+    """Execute a travel request and yield progress events while the crew runs on a thread of ``executor``.
+
+    Yields ``{"event": ..., "data": ...}`` dicts: a ``booking`` event as soon as each
+    booking tool returns, a ``task`` event as each task finishes (the supervisor's
+    summary comes with its task), the request's ``report``, then a final ``result``
+    (or ``error``) event.
+    """
+    async for event in stream_events(
+            lambda sink: execute_crewai_travel_request(travel_request, idempotency_key, sink, session_id),
+            executor):
+        yield event
+
+async def execute_crewai_travel_requests_async(travel_requests: list[str], max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+                                               return_exceptions: bool = False):
+    """Execute many travel requests concurrently, at most ``max_concurrency`` at a time.
+
+    Results are returned in the same order as ``travel_requests``. By default the
+    first failure is raised and the requests that have not started yet are
+    cancelled; requests already running in a worker thread cannot be interrupted
+    and finish in the background. With ``return_exceptions=True`` a failed request
+    yields its exception and the rest of the batch carries on.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(travel_request: str):
+        async with semaphore:
+            return await execute_crewai_travel_request_async(travel_request)
+
+    tasks = [asyncio.create_task(run_one(request)) for request in travel_requests]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        # gather leaves the other tasks running when one fails
+        for task in tasks:
+            task.cancel()
+        raise
+
 
 if __name__ == "__main__":
+    from monocle_apptrace.instrumentation.common.scope_wrapper import monocle_trace_scope
+
+    init(TravelAgentConfig(warm_crews=1))
     session_id = generate_session_id()
     print(f"Session: {session_id}")
     with monocle_trace_scope("agentic.session", session_id):
@@ -200,7 +628,7 @@ if __name__ == "__main__":
                     continue
                 
                 # Execute the travel request
-                result = execute_crewai_travel_request(user_request)
+                result = execute_crewai_travel_request(user_request, session_id=session_id)
                 
                 print(f"\nAssistant: {result}\n")
                 
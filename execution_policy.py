@@ -0,0 +1,151 @@
+"""Limits on how much agent work one travel request may cause.
+
+- Each request gets a ``RequestBudget`` of LLM calls and wall-clock seconds. The
+  budget is checked after every agent step; once it is spent, the next step that
+  would need another LLM call aborts the request with ``RequestBudgetExceeded``.
+  A step that finishes its task is let through, so a request can end on the call
+  that spends its budget. A single LLM call in flight is not interrupted.
+- A booking tool called again with the same arguments in the same request returns
+  the earlier successful result instead of booking again.
+- An agent watched with an escalation model switches to it for the rest of the
+  request once one of its tool calls fails, e.g. on arguments that do not
+  validate. Cheap models can then serve the common case.
+
+Each pooled crew owns an ``AgentGuard`` shared by its agents and tools. The guard
+is started with a fresh budget for every request the crew serves.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBudgetExceeded(RuntimeError):
+    """A travel request used up its LLM calls or its time."""
+
+
+class RequestBudget:
+    """LLM calls and wall-clock seconds one request may spend; ``None`` means unlimited."""
+
+    def __init__(self, max_llm_calls: Optional[int] = None, max_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_llm_calls = max_llm_calls
+        self.max_seconds = max_seconds
+        self.llm_calls = 0
+        self._clock = clock
+        self._deadline = None if max_seconds is None else clock() + max_seconds
+        self._lock = threading.Lock()
+
+    def spend_llm_call(self) -> None:
+        # Parallel tasks spend from several threads
+        with self._lock:
+            self.llm_calls += 1
+
+    def exceeded(self) -> Optional[str]:
+        """Why the budget is spent, or None while it is not."""
+        if self.max_llm_calls is not None and self.llm_calls >= self.max_llm_calls:
+            return f"used {self.llm_calls} of {self.max_llm_calls} LLM calls"
+        if self._deadline is not None and self._clock() >= self._deadline:
+            return f"ran longer than {self.max_seconds:g} seconds"
+        return None
+
+
+def _call_key(tool_name: str, arguments: dict) -> str:
+    def normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split()).casefold()
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        return value
+    return json.dumps([tool_name, normalize(arguments)], sort_keys=True, default=str)
+
+
+class AgentGuard:
+    """Enforces the current request's budget on a crew's agents, escalates their models and deduplicates
+    their tool calls."""
+
+    def __init__(self, events=None):
+        self.events = events
+        self._budget: Optional[RequestBudget] = None
+        self._results = {}
+        self._agents = []
+        self._models = {}
+        self._tasks = {}
+        self._tool_errors = {}
+        self._lock = threading.Lock()
+
+    def watch(self, agent, escalation_llm=None) -> None:
+        """Check the budget after every step of ``agent``, and clear its per-request state on ``start``.
+
+        With ``escalation_llm`` the agent moves to that model when a tool call fails
+        and stays on it until the request ends. An ``escalation`` event reports it.
+        """
+        agent.step_callback = self._step_callback(agent)
+        self._agents.append(agent)
+        self._models[id(agent)] = (agent.llm, escalation_llm)
+
+    def start(self, budget: Optional[RequestBudget]) -> None:
+        with self._lock:
+            self._budget = budget
+            self._results = {}
+            # Tasks count tool errors for their lifetime; this request's errors are the ones beyond these
+            self._tool_errors = {key: task.tools_errors for key, task in self._tasks.items()}
+        for agent in self._agents:
+            # CrewAI keeps an agent's tool results and failed attempts for its lifetime; a pooled
+            # agent would otherwise answer with a tool result from an earlier request
+            agent.tools_results = []
+            agent._times_executed = 0
+            agent.llm = self._models[id(agent)][0]
+
+    def stop(self) -> None:
+        self.start(None)
+
+    def recall(self, tool_name: str, arguments: dict) -> Optional[dict]:
+        """The successful result of an identical call earlier in this request, if there was one."""
+        with self._lock:
+            return self._results.get(_call_key(tool_name, arguments))
+
+    def remember(self, tool_name: str, arguments: dict, result: dict) -> None:
+        if result.get("status") == "success":
+            with self._lock:
+                self._results[_call_key(tool_name, arguments)] = result
+
+    def _escalate_on_tool_error(self, agent) -> None:
+        escalation_llm = self._models[id(agent)][1]
+        executor = agent.agent_executor
+        task = getattr(executor, "task", None)
+        if escalation_llm is None or task is None or agent.llm is escalation_llm:
+            return
+        with self._lock:
+            self._tasks.setdefault(id(task), task)
+            if task.tools_errors <= self._tool_errors.get(id(task), 0):
+                return
+        logger.info("%s escalates to %s after a failed tool call", agent.role, escalation_llm.model)
+        # The running executor and any retry of the task both take the stronger model
+        agent.llm = executor.llm = escalation_llm
+        if self.events is not None:
+            self.events.emit("escalation", {"agent": agent.role, "model": escalation_llm.model})
+
+    def _step_callback(self, agent) -> Callable[[Any], None]:
+        def callback(step):
+            if not hasattr(step, "text"):
+                self._escalate_on_tool_error(agent)
+            budget = self._budget
+            if budget is None:
+                return
+            # Steps are the agent's actions and final answers, and tool results. A tool result
+            # that ends the task is the only step reported for its LLM call
+            ends_task = hasattr(step, "output") or getattr(step, "result_as_answer", False)
+            if hasattr(step, "text") or ends_task:
+                budget.spend_llm_call()
+            reason = budget.exceeded()
+            if reason and not ends_task:
+                # Retrying the task would only run into the same budget
+                agent._times_executed = agent.max_retry_limit
+                raise RequestBudgetExceeded(f"Travel request stopped: it {reason}")
+        return callback
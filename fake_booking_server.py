@@ -0,0 +1,102 @@
+"""Local fake booking service for HttpBookingBackend.
+
+Serves ``POST /hotels`` and ``POST /flights`` with the same confirmations as the
+simulated backend. Responses are stored per ``Idempotency-Key``, so a repeated key
+returns the original confirmation without booking again. ``--failure-rate`` makes
+that share of requests fail with 503 to exercise client retries.
+
+Usage:
+    python fake_booking_server.py [--port 8081] [--latency 0.1] [--failure-rate 0.0]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from booking_backends import flight_confirmation, hotel_confirmation
+
+_BOOKERS = {
+    "/hotels": lambda booking: hotel_confirmation(
+        booking["hotel_name"], booking["city"], booking["check_in_date"], booking.get("nights", 1)),
+    "/flights": lambda booking: flight_confirmation(
+        booking["from_airport"], booking["to_airport"], booking.get("date", "next week")),
+}
+
+
+class FakeBookingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, failure_rate: float = 0.0):
+        super().__init__(address, _BookingHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.bookings_made = 0
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def book(self, path: str, booking: dict, idempotency_key: str) -> dict:
+        with self._lock:
+            if idempotency_key in self._responses:
+                return self._responses[idempotency_key]
+        time.sleep(self.latency)
+        response = _BOOKERS[path](booking)
+        with self._lock:
+            # A concurrent duplicate may have finished first; keep its response
+            response = self._responses.setdefault(idempotency_key, response)
+            self.bookings_made = len(self._responses)
+        return response
+
+
+class _BookingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        booking = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path not in _BOOKERS:
+            return self._send(404, {"status": "error", "message": f"Unknown path {self.path}"})
+        if random.random() < self.server.failure_rate:
+            return self._send(503, {"status": "error", "message": "Booking service temporarily unavailable"})
+        idempotency_key = self.headers.get("Idempotency-Key") or repr(time.time_ns())
+        try:
+            self._send(200, self.server.book(self.path, booking, idempotency_key))
+        except KeyError as missing:
+            self._send(400, {"status": "error", "message": f"Missing field {missing}"})
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_booking_server(port: int = 0, latency: float = 0.0, failure_rate: float = 0.0) -> FakeBookingServer:
+    """Start a fake booking server on a background thread; call ``shutdown()`` to stop it."""
+    server = FakeBookingServer(("127.0.0.1", port), latency, failure_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeBookingServer(("127.0.0.1", args.port), args.latency, args.failure_rate)
+    print(f"Fake booking service listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
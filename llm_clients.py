@@ -0,0 +1,76 @@
+"""Shared LLM clients for the travel agents.
+
+All agents use one connection-pooled HTTP client (HTTP/2 when the ``h2`` package
+is installed), so TLS handshakes and keep-alive connections are shared across
+agents and requests. CrewAI turns each agent's ``ChatOpenAI`` into a litellm-backed
+LLM, so the same clients and the optional completion cache are also installed on
+litellm, which is what actually sends the agents' requests.
+"""
+import importlib.util
+import threading
+
+import httpx
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_http_client = None
+_async_http_client = None
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                        keepalive_expiry=60)
+
+
+def shared_http_clients(max_connections: int = 20):
+    """Return the process-wide ``(httpx.Client, httpx.AsyncClient)`` pair, creating it once."""
+    global _http_client, _async_http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(http2=HTTP2_AVAILABLE, limits=_limits(max_connections))
+            _async_http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=_limits(max_connections))
+            import litellm
+            litellm.client_session = _http_client
+            litellm.aclient_session = _async_http_client
+    return _http_client, _async_http_client
+
+
+def enable_llm_cache(max_entries: int = 1000, ttl_seconds: float = 3600):
+    """Cache LLM completions in memory, keyed by a hash of the model, messages and parameters.
+
+    Completions expire after ``ttl_seconds`` and the oldest are evicted once
+    ``max_entries`` is reached.
+    """
+    import litellm
+    cache = litellm.Cache(type="local", ttl=ttl_seconds)
+    cache.cache.max_size_in_memory = max_entries
+    litellm.cache = cache
+    return cache
+
+
+def create_agent_llm(model: str, max_connections: int = 20):
+    """Create a CrewAI ``LLM`` for any litellm model string, e.g. ``gpt-4o`` or ``ollama/llama3.1``.
+
+    Agents turn the chat model they are given into one of these. A model switched
+    into a running agent must already be one.
+    """
+    from crewai import LLM
+
+    shared_http_clients(max_connections)
+    return LLM(model=model)
+
+
+def create_llm(model: str, tool_choice: str, max_connections: int = 20):
+    """Create a ``ChatOpenAI`` chat model that uses the shared HTTP clients.
+
+    A ``provider/model`` name, such as ``ollama/llama3.1`` for a local model served
+    at ``OLLAMA_API_BASE``, is created with ``create_agent_llm`` instead.
+    """
+    if "/" in model:
+        return create_agent_llm(model, max_connections)
+    from langchain_openai import ChatOpenAI
+
+    http_client, async_http_client = shared_http_clients(max_connections)
+    return ChatOpenAI(model=model, tool_choice=tool_choice,
+                      http_client=http_client, http_async_client=async_http_client)
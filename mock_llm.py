@@ -0,0 +1,136 @@
+"""Offline stand-in LLM for running the crew without network access.
+
+``MockLLM`` answers CrewAI's ReAct prompts with scripted replies: a specialist agent
+gets one ``book_hotel``/``book_flight`` action built from the arguments in its task
+description, then a final answer built from the tool's observation. The supervisor
+summarizes the confirmations in its context. Each call sleeps for a delay drawn
+from a configurable latency model, so orchestration overhead can be measured
+separately from LLM latency. With ``invalid_tool_call_rate`` some tool calls leave
+out a required argument, like a weak model would. A failed tool call is retried.
+"""
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+
+_TOOL_NAME = re.compile(r"Tool Name: (\w+)")
+_SLOT_LINE = re.compile(r"Arguments already extracted for (\w+)[^:]*: (.*)")
+_SLOT = re.compile(r"(\w+)=([^,\n]*)")
+_TOOL_MESSAGE = re.compile(r"""['"]message['"]:\s*['"](.*?)['"]\s*}""")
+_CONTEXT = re.compile(r"This is the context you're working with:\s*(.*?)\s*(?:Begin!|$)", re.DOTALL)
+
+# Values used when the router could not extract an argument
+_DEFAULT_ARGS = {
+    "book_hotel": {"hotel_name": "Marriott", "city": "the destination", "check_in_date": "next week", "nights": 1},
+    "book_flight": {"from_airport": "the origin", "to_airport": "the destination", "date": "next week"},
+}
+
+
+class LatencyModel:
+    """Per-call delay distribution in seconds.
+
+    Specs look like ``fixed:0.5``, ``uniform:0.2,1.0`` or ``lognormal:0.7,0.4``
+    (median seconds, sigma). ``none`` disables the delay.
+    """
+
+    def __init__(self, spec: str = "none", seed: Optional[int] = None):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self._kind = kind.strip().lower()
+        self._params = [float(value) for value in params.split(",") if value.strip()]
+        if self._kind not in ("none", "fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency model: {spec!r}")
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        if self._kind == "fixed":
+            return self._params[0]
+        if self._kind == "uniform":
+            return self._random.uniform(*self._params[:2])
+        if self._kind == "lognormal":
+            median, sigma = self._params[:2]
+            return median * self._random.lognormvariate(0, sigma)
+        return 0.0
+
+
+class MockLLM(LLM):
+    """CrewAI LLM that answers with scripted tool calls instead of calling a provider."""
+
+    _calls = 0
+    _calls_lock = threading.Lock()
+
+    def __init__(self, latency: Union[str, LatencyModel] = "none", model: str = "mock/travel-agent",
+                 invalid_tool_call_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(model=model)
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency)
+        self.invalid_tool_call_rate = invalid_tool_call_rate
+        self._random = random.Random(seed)
+
+    @classmethod
+    def call_count(cls) -> int:
+        """Total number of calls made to any MockLLM in this process."""
+        with cls._calls_lock:
+            return cls._calls
+
+    def call(self, messages: Union[str, List[Dict[str, str]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None) -> str:
+        with MockLLM._calls_lock:
+            MockLLM._calls += 1
+        time.sleep(self.latency.sample())
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        return self._reply(messages)
+
+    def _reply(self, messages: List[Dict[str, str]]) -> str:
+        prompt = "\n".join(message["content"] for message in messages)
+        tool_names = _TOOL_NAME.findall(prompt)
+        observations = [message["content"] for message in messages
+                        if message["role"] == "assistant" and "Observation:" in message["content"]]
+
+        # Specialist tasks name their single-booking tool in the extracted-arguments line
+        slot_tools = [tool for tool, _ in _SLOT_LINE.findall(prompt) if tool in tool_names]
+        tool_name = slot_tools[0] if slot_tools else tool_names[0] if len(tool_names) == 1 else None
+
+        if observations:
+            observation = observations[-1].split("Observation:", 1)[1].strip()
+            confirmation = _TOOL_MESSAGE.search(observation)
+            # An observation without a booking result is a failed tool call
+            if confirmation or tool_name is None:
+                answer = confirmation.group(1) if confirmation else observation
+                return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+        if tool_name is not None:
+            args = self._tool_args(tool_name, prompt)
+            if self._random.random() < self.invalid_tool_call_rate:
+                args.pop(next(iter(args)))
+            return (f"Thought: I should book this with {tool_name}\nAction: {tool_name}\n"
+                    f"Action Input: {json.dumps(args)}")
+
+        context = _CONTEXT.search(prompt)
+        summary = context.group(1) if context else "All requested travel services have been booked."
+        return f"Thought: I now know the final answer\nFinal Answer: Travel booking summary:\n{summary}"
+
+    @staticmethod
+    def _tool_args(tool_name: str, prompt: str) -> dict:
+        args = dict(_DEFAULT_ARGS.get(tool_name, {}))
+        for line_tool, slots in _SLOT_LINE.findall(prompt):
+            if line_tool != tool_name:
+                continue
+            for name, value in _SLOT.findall(slots):
+                value = value.strip()
+                if name in args and value and value != "not given":
+                    args[name] = int(value) if isinstance(args[name], int) else value
+        return args
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
@@ -0,0 +1,85 @@
+"""Token budgeting for the travel request text placed in task prompts.
+
+The request is fitted to the budget once per request and the same text fills every
+task, so a long message costs the same number of tokens in each prompt. An
+oversized request keeps only its sentences that carry booking details (services,
+places, dates, nights), in their original order, and is cut at the budget if it is
+still too long. ``task_prompt_tokens`` estimates what each task's prompt costs.
+"""
+import importlib.util
+import re
+from functools import lru_cache
+
+from travel_router import route_travel_request
+
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+
+# Rough size of a token in English text when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+_ELLIPSIS = " ..."
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """The tiktoken encoding, or None if tiktoken or its encoding file (downloaded on first use) is unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    import tiktoken
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text``, exact with tiktoken and estimated without it."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens]).rstrip() + _ELLIPSIS
+    limit = max_tokens * _CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit].rstrip() + _ELLIPSIS
+
+
+def _has_booking_details(sentence: str) -> bool:
+    intent = route_travel_request(sentence)
+    return bool(intent.services or intent.dates or intent.origin or intent.nights)
+
+
+def fit_request(travel_request: str, max_tokens: int) -> str:
+    """Return ``travel_request`` with collapsed whitespace, fitted to ``max_tokens`` tokens."""
+    text = _WHITESPACE.sub(" ", travel_request).strip()
+    if count_tokens(text) <= max_tokens:
+        return text
+    sentences = [sentence for sentence in _SENTENCE_END.split(travel_request) if sentence.strip()]
+    relevant = [_WHITESPACE.sub(" ", sentence).strip() for sentence in sentences if _has_booking_details(sentence)]
+    return _truncate(" ".join(relevant) if relevant else text, max_tokens)
+
+
+def task_prompt_tokens(tasks) -> dict:
+    """Estimated prompt tokens per task name for a crew whose task descriptions are filled in.
+
+    Counts the agent's role, goal, backstory and tool descriptions, which are resent
+    on every agent iteration, the task description and expected output, and the
+    outputs of the context tasks.
+    """
+    report = {}
+    for task in tasks:
+        agent = task.agent
+        parts = [task.description, task.expected_output]
+        if agent is not None:
+            parts += [agent.role, agent.goal, agent.backstory] + [tool.description for tool in agent.tools or []]
+        for context_task in task.context or []:
+            if context_task.output is not None:
+                parts.append(context_task.output.raw)
+        report[task.name] = count_tokens("\n".join(part for part in parts if part))
+    return report
@@ -0,0 +1,29 @@
+"""Loading travel request corpora stored as JSON lines.
+
+Each line is a JSON object holding the request text under ``request``,
+``travel_request`` or ``body``, and optionally an ID under ``request_id`` or ``id``.
+"""
+import json
+from pathlib import Path
+from typing import Iterator, Union
+
+_TEXT_FIELDS = ("request", "travel_request", "body")
+_ID_FIELDS = ("request_id", "id")
+
+
+def iter_travel_requests(path: Union[str, Path]) -> Iterator[dict]:
+    """Yield ``{"id": ..., "request": ...}`` for every non-empty line of a corpus."""
+    with open(path, encoding="utf-8") as corpus:
+        for line_number, line in enumerate(corpus, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = next((record[field] for field in _TEXT_FIELDS if record.get(field)), None)
+            if text is None:
+                raise ValueError(f"{path}:{line_number}: no request text in any of {_TEXT_FIELDS}")
+            request_id = next((record[field] for field in _ID_FIELDS if record.get(field) is not None), line_number)
+            yield {"id": str(request_id), "request": text}
+
+
+def load_travel_requests(path: Union[str, Path]) -> list:
+    return list(iter_travel_requests(path))
@@ -0,0 +1,149 @@
+"""Per-request timing and token report, and process-wide Prometheus histograms.
+
+A ``RequestReport`` records one request: the wall time of each stage (routing,
+crew checkout including any crew construction, kickoff or direct booking), each
+task's duration, every booking tool call, the agents that escalated to a stronger
+model, and the LLM calls and tokens the crew used. Everything recorded on a report is also observed in the histograms of
+``REGISTRY``, which ``render_metrics`` serves in the Prometheus text format.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+CALL_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+
+
+class Histogram:
+    """Cumulative histogram with one series per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            # Per-bucket counts, then the total count and sum
+            series = self._series.setdefault(label_values, [0] * len(self.buckets) + [0, 0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            series = self._series.get(label_values)
+            return series[-2] if series else 0
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                labels = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+                prefix = f"{labels}," if labels else ""
+                for bound, bucket_count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-2]}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{self.name}_sum{suffix} {series[-1]}")
+                lines.append(f"{self.name}_count{suffix} {series[-2]}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._histograms.setdefault(name, Histogram(name, help_text, label_names, buckets))
+
+    def render(self) -> str:
+        return "".join(histogram.render() for histogram in self._histograms.values())
+
+
+REGISTRY = MetricsRegistry()
+REQUEST_SECONDS = REGISTRY.histogram("travel_agent_request_seconds", "Wall time of a travel request")
+STAGE_SECONDS = REGISTRY.histogram("travel_agent_stage_seconds", "Wall time of a request stage", ("stage",))
+TASK_SECONDS = REGISTRY.histogram("travel_agent_task_seconds", "Wall time of a crew task", ("task",))
+TOOL_SECONDS = REGISTRY.histogram("travel_agent_tool_seconds", "Wall time of a booking tool call",
+                                  ("tool", "status"))
+LLM_CALLS = REGISTRY.histogram("travel_agent_llm_calls", "LLM calls per request", buckets=CALL_BUCKETS)
+TOKENS = REGISTRY.histogram("travel_agent_tokens", "LLM tokens per request", ("kind",), TOKEN_BUCKETS)
+
+
+def render_metrics() -> str:
+    """Every histogram in the Prometheus text exposition format."""
+    return REGISTRY.render()
+
+
+@dataclass
+class RequestReport:
+    """Where the time and tokens of one travel request went."""
+    stages: Dict[str, float] = field(default_factory=dict)
+    tasks: Dict[str, float] = field(default_factory=dict)
+    tools: list = field(default_factory=list)
+    escalations: list = field(default_factory=list)
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated_prompt_tokens: Dict[str, int] = field(default_factory=dict)
+    total_seconds: Optional[float] = None
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        STAGE_SECONDS.observe(seconds, stage)
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Record the wall time of the ``with`` block as ``stage``, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def record_task(self, task: str, seconds: Optional[float]) -> None:
+        if seconds is not None:
+            self.tasks[task] = seconds
+            TASK_SECONDS.observe(seconds, task)
+
+    def record_tool(self, tool: str, seconds: float, status: str) -> None:
+        # Tools of parallel tasks report from several threads
+        with self._lock:
+            self.tools.append({"tool": tool, "seconds": seconds, "status": status})
+        TOOL_SECONDS.observe(seconds, tool, status)
+
+    def record_escalation(self, agent: str, model: str) -> None:
+        with self._lock:
+            self.escalations.append({"agent": agent, "model": model})
+
+    def record_usage(self, llm_calls: int, prompt_tokens: int, completion_tokens: int) -> None:
+        self.llm_calls += llm_calls
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def finish(self) -> "RequestReport":
+        """Close the report and observe the per-request totals."""
+        self.total_seconds = time.perf_counter() - self._started
+        REQUEST_SECONDS.observe(self.total_seconds)
+        LLM_CALLS.observe(self.llm_calls)
+        TOKENS.observe(self.prompt_tokens, "prompt")
+        TOKENS.observe(self.completion_tokens, "completion")
+        return self
+
+    def as_dict(self) -> dict:
+        return asdict(self)
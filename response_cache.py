@@ -0,0 +1,187 @@
+"""Cache of final travel request responses.
+
+A cached response stands for a booking that has already been made, so a hit
+returns the stored confirmation instead of running the crew (and its booking
+tools) again. Concurrent duplicates of an in-flight request wait for the first
+one to finish rather than booking a second time.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable, Optional
+
+from travel_router import TravelIntent
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_request(travel_request: str) -> str:
+    """Lower-case a request and collapse whitespace and trailing punctuation."""
+    return _WHITESPACE.sub(" ", travel_request).strip().rstrip(".!?").lower()
+
+
+def cache_key(travel_request: str, intent: TravelIntent, idempotency_key: str) -> str:
+    """Build the cache key for a request.
+
+    A request whose booking slots are all filled is keyed on the intent alone, so
+    differently worded requests for the same bookings share an entry. Otherwise the
+    normalized text is part of the key. ``idempotency_key`` (e.g. a session ID)
+    keeps identical requests from different travelers apart; requests without one
+    must not be cached.
+    """
+    parts = {"intent": asdict(intent), "idempotency_key": idempotency_key}
+    if not intent.has_complete_slots():
+        parts["request"] = normalize_request(travel_request)
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class _MemoryBackend:
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    def get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value, created):
+        self._entries[key] = (value, created)
+        self._entries.move_to_end(key)
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+    def evict_to(self, max_entries):
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _SQLiteBackend:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key, now):
+        row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row
+
+    def put(self, key, value, created):
+        self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                           (key, value, created, created))
+        self._conn.commit()
+
+    def delete(self, key):
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def evict_to(self, max_entries):
+        self._conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)", (max_entries,))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with a TTL, kept in memory or in a SQLite file.
+
+    Entry ages use wall-clock time so they stay meaningful in a SQLite file that
+    outlives the process.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, sqlite_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._backend = _SQLiteBackend(sqlite_path) if sqlite_path else _MemoryBackend()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def _lookup(self, key: str) -> Optional[str]:
+        now = self._clock()
+        entry = self._backend.get(key, now)
+        if entry is None:
+            return None
+        value, created = entry
+        if now - created > self.ttl_seconds:
+            self._backend.delete(key)
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._backend.put(key, value, self._clock())
+            self._backend.evict_to(self.max_entries)
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        """Return the cached value for ``key`` or compute and store it.
+
+        Only one caller computes a given key at a time; duplicates that arrive
+        meanwhile get the stored result once it is ready. Failures are not cached.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            key_lock, waiters = self._inflight.get(key, (threading.Lock(), 0))
+            self._inflight[key] = (key_lock, waiters + 1)
+        try:
+            with key_lock:
+                with self._lock:
+                    value = self._lookup(key)
+                    if value is None:
+                        self.misses += 1
+                    else:
+                        self.hits += 1
+                if value is None:
+                    value = compute()
+                    self.put(key, value)
+                return value
+        finally:
+            with self._lock:
+                key_lock, waiters = self._inflight[key]
+                if waiters == 1:
+                    del self._inflight[key]
+                else:
+                    self._inflight[key] = (key_lock, waiters - 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._backend.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
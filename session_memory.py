@@ -0,0 +1,215 @@
+"""Booking state carried across the turns of a session.
+
+CrewAI's ``memory=True`` only lasts for one crew execution, so a follow-up such as
+"make it 5 nights" would otherwise have to be worked out from scratch. The
+``SessionStore`` keeps a small structured ``SessionState`` per session ID: the
+arguments of the last hotel and flight bookings and their latest confirmations,
+never the transcript. A new turn fills the gaps in its routed intent from that
+state, and the specialist tasks are only told what changed.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, Optional
+
+from travel_router import FLIGHT_SERVICE, HOTEL_SERVICE, TravelIntent
+
+# Confirmations kept per session; older ones are dropped
+MAX_CONFIRMATIONS = 4
+
+_BOOKING_TOOLS = {"book_hotel": HOTEL_SERVICE, "book_flight": FLIGHT_SERVICE}
+
+# Tool arguments that tell one booking of a service from another
+_BOOKING_IDENTITY = {HOTEL_SERVICE: ("hotel_name", "city"), FLIGHT_SERVICE: ("from_airport", "to_airport")}
+
+
+def _format_args(args: dict) -> str:
+    return ", ".join(f"{name}={value}" for name, value in args.items())
+
+
+@dataclass
+class SessionState:
+    """Compact booking state of one session."""
+    services: tuple = ()
+    hotel: dict = field(default_factory=dict)
+    flight: dict = field(default_factory=dict)
+    confirmations: list = field(default_factory=list)
+    turns: int = 0
+
+    def _booked(self, service: str) -> dict:
+        return self.hotel if service == HOTEL_SERVICE else self.flight
+
+    def _continues(self, service: str, slots) -> bool:
+        """Whether a turn with ``slots`` refers to the earlier booking of ``service``.
+
+        It does unless it names a different hotel or city, or a different origin or destination.
+        """
+        previous = self._booked(service)
+        if not previous or slots is None:
+            return False
+        named = slots.as_tool_args()
+        return all(not named.get(name) or not previous.get(name)
+                   or str(named[name]).casefold() == str(previous[name]).casefold()
+                   for name in _BOOKING_IDENTITY[service])
+
+    def apply(self, intent: TravelIntent) -> TravelIntent:
+        """Fill the details a follow-up turn leaves out from the earlier bookings.
+
+        A turn that names no service at all (e.g. "move it to June 5") refers to the
+        services of the previous turn, and its first date applies to them. A turn
+        for a different booking, such as another hotel, keeps only its own details.
+        """
+        if not self.turns:
+            return intent
+        if not intent.services and self.services:
+            date = intent.dates[0] if intent.dates else None
+            intent = replace(intent, services=self.services, flight_date=date, check_in_date=date)
+        changes = {}
+        if self._continues(HOTEL_SERVICE, intent.hotel_slots):
+            changes.update(
+                hotel_name=intent.hotel_name or self.hotel.get("hotel_name"),
+                hotel_city=intent.hotel_city or self.hotel.get("city"),
+                check_in_date=intent.check_in_date or self.hotel.get("check_in_date"),
+                nights=intent.nights or self.hotel.get("nights"),
+            )
+        if self._continues(FLIGHT_SERVICE, intent.flight_slots):
+            changes.update(
+                origin=intent.origin or self.flight.get("from_airport"),
+                destination=intent.destination or self.flight.get("to_airport"),
+                flight_date=intent.flight_date or self.flight.get("date"),
+            )
+        return replace(intent, **changes)
+
+    def describe(self, service: str, slots) -> str:
+        """One line for a task description: the earlier booking of ``service`` and what this turn changes."""
+        if not self._continues(service, slots):
+            return "none"
+        previous = self._booked(service)
+        changed = {name: value for name, value in slots.as_tool_args().items()
+                   if value and previous.get(name) != value}
+        delta = f"this turn changes {_format_args(changed)}" if changed else "this turn repeats it"
+        return f"already booked {_format_args(previous)}; {delta}"
+
+    def record(self, intent: TravelIntent, bookings: list) -> "SessionState":
+        """Return the state after a turn that routed to ``intent`` and made ``bookings``.
+
+        ``bookings`` are the tools' ``booking`` events. Only successful single bookings
+        replace the stored arguments; every confirmation message is kept.
+        """
+        hotel, flight = dict(self.hotel), dict(self.flight)
+        confirmations = list(self.confirmations)
+        for event in bookings:
+            if event.get("message"):
+                confirmations.append(event["message"])
+            service = _BOOKING_TOOLS.get(event.get("tool"))
+            if service is None or event.get("status") != "success" or not event.get("booking"):
+                continue
+            if service == HOTEL_SERVICE:
+                hotel = dict(event["booking"])
+            else:
+                flight = dict(event["booking"])
+        return SessionState(services=intent.services or self.services, hotel=hotel, flight=flight,
+                            confirmations=confirmations[-MAX_CONFIRMATIONS:], turns=self.turns + 1)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionState":
+        fields = json.loads(data)
+        fields["services"] = tuple(fields.get("services", ()))
+        return cls(**fields)
+
+
+class _MemoryBackend:
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    def get(self, session_id):
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._entries.move_to_end(session_id)
+        return entry
+
+    def put(self, session_id, state, updated):
+        self._entries[session_id] = (state, updated)
+        self._entries.move_to_end(session_id)
+
+    def delete(self, session_id):
+        self._entries.pop(session_id, None)
+
+    def evict_to(self, max_sessions):
+        while len(self._entries) > max_sessions:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _SQLiteBackend:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)")
+        self._conn.commit()
+
+    def get(self, session_id):
+        row = self._conn.execute("SELECT state, updated FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return (SessionState.from_json(row[0]), row[1]) if row is not None else None
+
+    def put(self, session_id, state, updated):
+        self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", (session_id, state.to_json(), updated))
+        self._conn.commit()
+
+    def delete(self, session_id):
+        self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self._conn.commit()
+
+    def evict_to(self, max_sessions):
+        self._conn.execute(
+            "DELETE FROM sessions WHERE session_id NOT IN "
+            "(SELECT session_id FROM sessions ORDER BY updated DESC LIMIT ?)", (max_sessions,))
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class SessionStore:
+    """Thread-safe LRU of ``SessionState`` by session ID, in memory or in a SQLite file.
+
+    At most ``max_sessions`` sessions are kept, and a session idle for longer than
+    ``ttl_seconds`` starts over. Concurrent turns of one session are last-writer-wins.
+    """
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 86400, sqlite_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._backend = _SQLiteBackend(sqlite_path) if sqlite_path else _MemoryBackend()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SessionState:
+        """Return the session's state, or an empty one for a new or expired session."""
+        with self._lock:
+            entry = self._backend.get(session_id)
+            if entry is None:
+                return SessionState()
+            state, updated = entry
+            if self._clock() - updated > self.ttl_seconds:
+                self._backend.delete(session_id)
+                return SessionState()
+            return state
+
+    def put(self, session_id: str, state: SessionState) -> None:
+        with self._lock:
+            self._backend.put(session_id, state, self._clock())
+            self._backend.evict_to(self.max_sessions)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._backend)
@@ -0,0 +1,225 @@
+"""Telemetry setup for the travel agent.
+
+``full`` mode is Monocle's default setup: every span of every request goes to each
+configured exporter. ``sampled`` mode keeps tracing cheap under load:
+
+- Head sampling records only ``head_sample_rate`` of traces. Spans of the other
+  traces are never recorded, so they cost almost nothing.
+- Tail sampling keeps every failed or slow trace, and ``tail_sample_rate`` of the
+  rest. A trace is decided when its root span ends.
+- Kept spans go into a bounded queue that a background thread exports in batches.
+  When the queue is full, new spans are dropped instead of blocking the request.
+- The ``file`` exporter writes JSON lines and rotates at ``file_max_bytes``,
+  gzipping the rotated files.
+
+``flush_telemetry`` exports everything queued so far, for tests and shutdown.
+"""
+import gzip
+import os
+import random
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import StatusCode
+
+TELEMETRY_MODE = os.environ.get("TRAVEL_AGENT_TELEMETRY_MODE", "full")
+HEAD_SAMPLE_RATE = float(os.environ.get("TRAVEL_AGENT_TRACE_SAMPLE_RATE", "1.0"))
+TAIL_SAMPLE_RATE = float(os.environ.get("TRAVEL_AGENT_TRACE_TAIL_SAMPLE_RATE", "1.0"))
+SLOW_TRACE_SECONDS = float(os.environ.get("TRAVEL_AGENT_TRACE_SLOW_SECONDS", "10"))
+SPAN_QUEUE_SIZE = int(os.environ.get("TRAVEL_AGENT_TRACE_QUEUE_SIZE", "2048"))
+EXPORT_BATCH_SIZE = int(os.environ.get("TRAVEL_AGENT_TRACE_BATCH_SIZE", "256"))
+EXPORT_DELAY_MILLIS = int(os.environ.get("TRAVEL_AGENT_TRACE_EXPORT_DELAY_MS", "1000"))
+TRACE_FILE_DIR = os.environ.get("TRAVEL_AGENT_TRACE_FILE_DIR", ".monocle")
+TRACE_FILE_MAX_BYTES = int(float(os.environ.get("TRAVEL_AGENT_TRACE_FILE_MAX_MB", "10")) * 1024 * 1024)
+TRACE_FILE_BACKUPS = int(os.environ.get("TRAVEL_AGENT_TRACE_FILE_BACKUPS", "5"))
+
+# Traces waiting for their root span in the tail sampler; the oldest are dropped beyond this
+MAX_PENDING_TRACES = 1024
+
+
+@dataclass
+class TelemetrySettings:
+    """How spans are sampled and exported; ``mode`` is ``full`` or ``sampled``."""
+    mode: str = TELEMETRY_MODE
+    head_sample_rate: float = HEAD_SAMPLE_RATE
+    tail_sample_rate: float = TAIL_SAMPLE_RATE
+    slow_trace_seconds: float = SLOW_TRACE_SECONDS
+    queue_size: int = SPAN_QUEUE_SIZE
+    batch_size: int = EXPORT_BATCH_SIZE
+    export_delay_millis: int = EXPORT_DELAY_MILLIS
+    file_dir: str = TRACE_FILE_DIR
+    file_max_bytes: int = TRACE_FILE_MAX_BYTES
+    file_backups: int = TRACE_FILE_BACKUPS
+
+    def __post_init__(self):
+        if self.mode not in ("full", "sampled"):
+            raise ValueError(f"Unknown telemetry mode: {self.mode!r}")
+
+
+class RotatingFileSpanExporter(SpanExporter):
+    """Writes spans as JSON lines to ``<directory>/<prefix>.jsonl``.
+
+    When the file reaches ``max_bytes`` it is gzipped to ``<prefix>.1.jsonl.gz``,
+    older archives shift up by one, and archives beyond ``backups`` are deleted.
+    """
+
+    def __init__(self, directory: str = TRACE_FILE_DIR, prefix: str = "traces", max_bytes: int = TRACE_FILE_MAX_BYTES,
+                 backups: int = TRACE_FILE_BACKUPS):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{prefix}.jsonl")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _archive(self, index: int) -> str:
+        return f"{self.path[:-len('.jsonl')]}.{index}.jsonl.gz"
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                if os.path.exists(self._archive(index)):
+                    os.replace(self._archive(index), self._archive(index + 1))
+            with open(self.path, "rb") as source, gzip.open(self._archive(1), "wb") as target:
+                shutil.copyfileobj(source, target)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            if self._file.closed:
+                return SpanExportResult.FAILURE
+            self._file.write(lines)
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Buffers each trace's spans until its root ends, then forwards or drops the whole trace.
+
+    A trace is kept if any span failed, if the root took at least
+    ``slow_trace_seconds``, or otherwise with probability ``sample_rate``. At most
+    ``max_pending_traces`` unfinished traces are buffered; the oldest are dropped.
+    """
+
+    def __init__(self, delegate: SpanProcessor, sample_rate: float = TAIL_SAMPLE_RATE,
+                 slow_trace_seconds: float = SLOW_TRACE_SECONDS, max_pending_traces: int = MAX_PENDING_TRACES,
+                 rng: random.Random = None):
+        self.delegate = delegate
+        self.sample_rate = sample_rate
+        self.slow_trace_seconds = slow_trace_seconds
+        self.max_pending_traces = max_pending_traces
+        self.kept_traces = 0
+        self.dropped_traces = 0
+        self._random = rng or random.Random()
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span, parent_context=None) -> None:
+        self.delegate.on_start(span, parent_context)
+
+    def _keep(self, spans: List[ReadableSpan], root: ReadableSpan) -> bool:
+        if any(span.status.status_code == StatusCode.ERROR for span in spans):
+            return True
+        if (root.end_time - root.start_time) / 1e9 >= self.slow_trace_seconds:
+            return True
+        return self._random.random() < self.sample_rate
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        # A span whose parent is remote or missing is the local root of its trace
+        is_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+            spans.append(span)
+            if not is_root:
+                self._pending[trace_id] = spans
+                if len(self._pending) > self.max_pending_traces:
+                    self._pending.popitem(last=False)
+                    self.dropped_traces += 1
+                return
+            keep = self._keep(spans, span)
+            if keep:
+                self.kept_traces += 1
+            else:
+                self.dropped_traces += 1
+        if keep:
+            for pending_span in spans:
+                self.delegate.on_end(pending_span)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self.delegate.shutdown()
+
+
+_processors: List[SpanProcessor] = []
+
+
+def _exporter(name: str, settings: TelemetrySettings) -> SpanExporter:
+    if name == "file":
+        return RotatingFileSpanExporter(settings.file_dir, max_bytes=settings.file_max_bytes,
+                                        backups=settings.file_backups)
+    from monocle_apptrace.exporters.monocle_exporters import get_monocle_exporter
+    return get_monocle_exporter(name)[0]
+
+
+def sampled_span_processors(exporters: str, settings: TelemetrySettings) -> List[SpanProcessor]:
+    """One batch processor per exporter name, each behind a tail sampler when it drops anything."""
+    processors = []
+    for name in (name.strip() for name in exporters.split(",")):
+        if not name:
+            continue
+        processor = BatchSpanProcessor(_exporter(name, settings), max_queue_size=settings.queue_size,
+                                       schedule_delay_millis=settings.export_delay_millis,
+                                       max_export_batch_size=min(settings.batch_size, settings.queue_size))
+        if settings.tail_sample_rate < 1:
+            processor = TailSamplingSpanProcessor(processor, settings.tail_sample_rate, settings.slow_trace_seconds)
+        processors.append(processor)
+    return processors
+
+
+def setup_telemetry(workflow_name: str, exporters: str, settings: Optional[TelemetrySettings] = None) -> None:
+    """Set up Monocle tracing with ``exporters`` (e.g. ``file,okahu``) as ``settings`` describe."""
+    from monocle_apptrace.instrumentation import setup_monocle_telemetry
+
+    settings = settings or TelemetrySettings()
+    if settings.mode == "full":
+        setup_monocle_telemetry(workflow_name=workflow_name, monocle_exporters_list=exporters)
+        return
+    if settings.head_sample_rate < 1:
+        # Read by the OpenTelemetry SDK when Monocle creates its tracer provider
+        os.environ.setdefault("OTEL_TRACES_SAMPLER", "parentbased_traceidratio")
+        os.environ.setdefault("OTEL_TRACES_SAMPLER_ARG", str(settings.head_sample_rate))
+    _processors[:] = sampled_span_processors(exporters, settings)
+    setup_monocle_telemetry(workflow_name=workflow_name, span_processors=list(_processors))
+
+
+def flush_telemetry(timeout_seconds: float = 30) -> bool:
+    """Export every span queued so far. Returns False if the timeout ran out first."""
+    timeout_millis = int(timeout_seconds * 1000)
+    flushed = all([processor.force_flush(timeout_millis) for processor in _processors])
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        flushed = provider.force_flush(timeout_millis) and flushed
+    return flushed
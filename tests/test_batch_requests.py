@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path to import crewai_travel_agent module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import crewai_travel_agent
+from crewai_travel_agent import (TravelAgentConfig, execute_crewai_travel_request_async,
+                                 execute_crewai_travel_requests_async)
+
+
+@pytest.fixture(autouse=True)
+def initialized(monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "_active_config", TravelAgentConfig(telemetry=False, preload=False))
+
+
+def test_request_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def execute(travel_request, idempotency_key=None, event_sink=None, session_id=None):
+        threads.append(threading.current_thread())
+        return f"booked: {travel_request}"
+
+    monkeypatch.setattr(crewai_travel_agent, "execute_crewai_travel_request", execute)
+    result = asyncio.run(execute_crewai_travel_request_async("Book a flight from JFK to LAX"))
+
+    assert result == "booked: Book a flight from JFK to LAX"
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_batch_keeps_order_and_concurrency_limit(monkeypatch):
+    running = []
+    peak = []
+
+    async def execute(travel_request, idempotency_key=None, session_id=None):
+        running.append(travel_request)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(travel_request)
+        return travel_request.upper()
+
+    monkeypatch.setattr(crewai_travel_agent, "execute_crewai_travel_request_async", execute)
+    requests = [f"request {n}" for n in range(7)]
+    results = asyncio.run(execute_crewai_travel_requests_async(requests, max_concurrency=3))
+
+    assert results == [request.upper() for request in requests]
+    assert max(peak) == 3
+    with pytest.raises(ValueError):
+        asyncio.run(execute_crewai_travel_requests_async(requests, max_concurrency=0))
+
+
+def test_failure_cancels_requests_not_yet_started(monkeypatch):
+    started = []
+    finished = []
+
+    async def execute(travel_request, idempotency_key=None, session_id=None):
+        started.append(travel_request)
+        if travel_request == "fails":
+            raise RuntimeError("booking service down")
+        await asyncio.sleep(0.05)
+        finished.append(travel_request)
+        return travel_request
+
+    monkeypatch.setattr(crewai_travel_agent, "execute_crewai_travel_request_async", execute)
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="booking service down"):
+            await execute_crewai_travel_requests_async(["fails", "slow", "queued 1", "queued 2"], max_concurrency=2)
+        # Give cancelled requests the chance to start if they were still scheduled
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    # The failure frees a slot that "queued 1" takes before the batch is cancelled
+    assert "queued 2" not in started
+    assert finished == []
+
+    results = asyncio.run(execute_crewai_travel_requests_async(["fails", "ok"], return_exceptions=True))
+    assert isinstance(results[0], RuntimeError) and results[1] == "ok"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
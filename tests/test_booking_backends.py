@@ -0,0 +1,109 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import booking_backends module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from booking_backends import HttpBookingBackend, SimulatedBookingBackend, booking_idempotency_key, booking_scope
+from fake_booking_server import start_fake_booking_server
+
+
+@pytest.fixture
+def fake_server():
+    server = start_fake_booking_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_backend_books_through_fake_server(fake_server):
+    backend = HttpBookingBackend(fake_server.url)
+
+    result = backend.book_flight("JFK", "LAX", "2026-05-01", idempotency_key="flight-1")
+
+    assert result == {"status": "success", "message": "Flight booked from JFK to LAX for 2026-05-01."}
+
+
+def test_repeated_idempotency_key_books_once(fake_server):
+    backend = HttpBookingBackend(fake_server.url)
+
+    async def book_twice():
+        return await asyncio.gather(*(
+            backend.abook_hotel("Marriott", "Mumbai", "27th April 2026", 4, idempotency_key="hotel-1")
+            for _ in range(2)))
+
+    first, second = asyncio.run(book_twice())
+    backend.book_hotel("Marriott", "Mumbai", "27th April 2026", 4, idempotency_key="hotel-1")
+
+    assert first == second
+    assert "Successfully booked a stay at Marriott in Mumbai" in first["message"]
+    assert fake_server.bookings_made == 1
+
+
+def test_retries_until_service_recovers(fake_server):
+    fake_server.failure_rate = 1.0
+    backend = HttpBookingBackend(fake_server.url, max_retries=2, backoff=0.01)
+
+    result = backend.book_flight("JFK", "LAX", "tomorrow", idempotency_key="flight-2")
+    assert result == {"status": "error", "message": "Booking service failed: HTTP 503"}
+
+    fake_server.failure_rate = 0.0
+    assert backend.book_flight("JFK", "LAX", "tomorrow", idempotency_key="flight-2")["status"] == "success"
+
+
+def test_unreachable_service_times_out_as_error():
+    backend = HttpBookingBackend("http://127.0.0.1:9", timeout=0.2, max_retries=1, backoff=0.01)
+
+    result = backend.book_flight("JFK", "LAX", "tomorrow", idempotency_key="flight-3")
+
+    assert result["status"] == "error"
+
+
+def test_batch_bookings_return_one_result_per_reservation(fake_server):
+    backend = HttpBookingBackend(fake_server.url)
+    legs = [
+        {"from_airport": "SFO", "to_airport": "JFK", "date": "1 May 2026"},
+        {"from_airport": "JFK", "to_airport": "LHR", "date": "4 May 2026"},
+        {"from_airport": "LHR", "to_airport": "SFO", "date": "9 May 2026"},
+    ]
+
+    results = backend.book_flights(legs, ["leg-1", "leg-2", "leg-3"])
+    async_results = asyncio.run(backend.abook_flights(legs, ["leg-1", "leg-2", "leg-3"]))
+
+    assert [result["message"] for result in results] == [
+        "Flight booked from SFO to JFK for 1 May 2026.",
+        "Flight booked from JFK to LHR for 4 May 2026.",
+        "Flight booked from LHR to SFO for 9 May 2026.",
+    ]
+    assert async_results == results
+    assert fake_server.bookings_made == 3
+
+
+def test_idempotency_keys_are_scoped_per_request():
+    booking = {"from_airport": "JFK", "to_airport": "LAX", "date": "tomorrow"}
+
+    with booking_scope("request-1"):
+        first = booking_idempotency_key("book_flight", booking)
+        assert booking_idempotency_key("book_flight", booking) == first
+    with booking_scope("request-2"):
+        assert booking_idempotency_key("book_flight", booking) != first
+    assert booking_idempotency_key("book_flight", booking) != booking_idempotency_key("book_flight", booking)
+
+
+def test_simulated_backend_async_bookings_overlap():
+    backend = SimulatedBookingBackend(latency=0.2)
+
+    async def book_many():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(backend.abook_flight("JFK", "LAX", "tomorrow", str(n)) for n in range(5)))
+        return loop.time() - start
+
+    assert asyncio.run(book_many()) < 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
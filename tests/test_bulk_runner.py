@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import bulk_runner module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bulk_runner import RateLimiter, completed_keys, idempotency_key, run_corpus, run_record, shard, summarize
+
+
+def test_rate_limiter_spaces_calls_after_the_burst():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    assert sleeps == [0.5, 0.5]
+
+
+def test_only_ok_results_count_as_done(tmp_path):
+    output = tmp_path / "results.jsonl"
+    assert completed_keys(output) == set()
+    output.write_text(json.dumps({"id": "1", "idempotency_key": "key-1", "status": "ok"}) + "\n" +
+                      json.dumps({"id": "2", "idempotency_key": "key-2", "status": "error"}) + "\n" +
+                      '{"id": "3", "sta')
+    assert completed_keys(output) == {"key-1"}
+
+
+def test_idempotency_keys_are_stable_per_corpus_and_request(tmp_path):
+    record = {"id": "1", "request": "Book a flight from JFK to LAX"}
+    key = idempotency_key(tmp_path / "monday.jsonl", record)
+
+    assert idempotency_key(tmp_path / "monday.jsonl", dict(record)) == key
+    assert idempotency_key(tmp_path / "tuesday.jsonl", record) != key
+    assert idempotency_key(tmp_path / "monday.jsonl", dict(record, request="Book a Marriott hotel")) != key
+
+
+def test_shards_are_round_robin():
+    assert shard(range(5), 2) == [[0, 2, 4], [1, 3]]
+
+
+def test_run_record_captures_result_error_and_report():
+    def execute(travel_request, idempotency_key, event_sink):
+        event_sink("report", {"llm_calls": 3, "prompt_tokens": 900, "completion_tokens": 60})
+        return f"booked {idempotency_key}"
+
+    def fail(travel_request, idempotency_key, event_sink):
+        raise TimeoutError("booking service down")
+
+    ok = run_record({"id": "7", "request": "Book a flight", "idempotency_key": "corpus-7"}, execute)
+    assert ok["status"] == "ok" and ok["result"] == "booked corpus-7" and ok["llm_calls"] == 3
+    assert ok["idempotency_key"] == "corpus-7"
+    failed = run_record({"id": "8", "request": "Book a flight"}, fail)
+    assert failed["status"] == "error" and failed["error"] == "TimeoutError: booking service down"
+    assert failed["llm_calls"] == 0
+
+    summary = summarize([ok, failed], elapsed=2.0, skipped=5)
+    assert summary["requests"] == 2 and summary["skipped"] == 5
+    assert summary["error_rate"] == 0.5 and summary["error_types"] == {"TimeoutError": 1}
+    assert summary["requests_per_second"] == 1.0 and summary["prompt_tokens"] == 900
+
+
+def test_corpus_runs_across_processes_and_resumes(tmp_path, monkeypatch):
+    # The spawned workers read their configuration from the environment
+    monkeypatch.setenv("TRAVEL_AGENT_MOCK_LLM", "true")
+    monkeypatch.setenv("TRAVEL_AGENT_TELEMETRY", "false")
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps({"request_id": f"r{index}", "request": request}) for index, request in
+                                enumerate(["Book a flight from JFK to LAX for next week.",
+                                           "Book a Marriott hotel in New York for 3 nights.",
+                                           "Book a flight from Boston to Miami on June 5."])))
+    done = {"id": "r1", "request": "Book a Marriott hotel in New York for 3 nights."}
+    output = tmp_path / "results.jsonl"
+    output.write_text(json.dumps(dict(done, idempotency_key=idempotency_key(corpus, done), status="ok",
+                                      result="earlier run")) + "\n")
+
+    summary = run_corpus(corpus, output, workers=2, threads=2, warm_crews=0)
+
+    assert summary["requests"] == 2 and summary["skipped"] == 1 and summary["errors"] == 0
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(result["id"] for result in results) == ["r0", "r1", "r2"]
+    assert len({result["worker"] for result in results[1:]}) == 2
+    assert all(result["idempotency_key"] == idempotency_key(corpus, result) for result in results)
+
+
+def test_checkpoint_is_keyed_on_the_idempotency_key(tmp_path, monkeypatch):
+    started = []
+    # Record the pending requests instead of starting workers for them
+    monkeypatch.setattr("bulk_runner.shard", lambda records, workers: started.extend(records) or [])
+    record = {"id": "r0", "request": "Book a flight from JFK to LAX for next week."}
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text(json.dumps({"request_id": "r0", "request": record["request"]}))
+    output = tmp_path / "results.jsonl"
+    # The same ID done for another request (or corpus), and a line from before keys were recorded
+    output.write_text(json.dumps({"id": "r0", "idempotency_key": "another-request", "status": "ok"}) + "\n" +
+                      json.dumps({"id": "r0", "status": "ok"}) + "\n")
+
+    assert run_corpus(corpus, output, workers=1)["skipped"] == 0
+    assert [pending["id"] for pending in started] == ["r0"]
+
+    started.clear()
+    with open(output, "a", encoding="utf-8") as out:
+        out.write(json.dumps(dict(record, idempotency_key=idempotency_key(corpus, record), status="ok")) + "\n")
+    assert run_corpus(corpus, output, workers=1)["skipped"] == 1 and started == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
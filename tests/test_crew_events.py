@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import crew_events module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crew_events import CrewEvents, stream_events
+
+
+def collect(run):
+    async def scenario():
+        return [event async for event in stream_events(run)]
+    return asyncio.run(scenario())
+
+
+def test_events_arrive_in_order_before_the_result():
+    def run(sink):
+        events = CrewEvents()
+        events.attach(sink)
+        events.emit("booking", {"tool": "book_flight", "status": "success"})
+        events.task_callback("Flight Booking Task")("Flight booked from JFK to LAX for next week.")
+        return "done"
+
+    assert collect(run) == [
+        {"event": "booking", "data": {"tool": "book_flight", "status": "success"}},
+        {"event": "task", "data": {"task": "Flight Booking Task",
+                                   "output": "Flight booked from JFK to LAX for next week."}},
+        {"event": "result", "data": {"result": "done"}},
+    ]
+
+
+def test_failure_ends_the_stream_with_an_error_event():
+    def run(sink):
+        sink("booking", {"status": "error"})
+        raise RuntimeError("crew failed")
+
+    events = collect(run)
+    assert [event["event"] for event in events] == ["booking", "error"]
+    assert events[-1]["data"] == {"error": "crew failed"}
+
+
+def test_detached_relay_drops_events():
+    received = []
+    events = CrewEvents()
+    events.attach(lambda event, data: received.append(event))
+    events.emit("booking", {})
+    events.attach(None)
+    events.emit("booking", {})
+    assert received == ["booking"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path to import crew_pool module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crew_pool import CrewPool
+
+
+def make_pool(max_idle_per_shape=4):
+    built = []
+
+    def factory(shape):
+        crew = {"shape": shape, "id": len(built)}
+        built.append(crew)
+        return crew
+
+    return CrewPool(factory, max_idle_per_shape=max_idle_per_shape), built
+
+
+def test_checkin_reuses_crew_for_same_shape():
+    pool, built = make_pool()
+    crew = pool.checkout(("hotel",))
+    pool.checkin(("hotel",), crew)
+
+    assert pool.checkout(("hotel",)) is crew
+    assert pool.checkout(("flight",))["shape"] == ("flight",)
+    assert len(built) == 2
+
+
+def test_concurrent_checkouts_never_share_a_crew():
+    pool, built = make_pool()
+    pool.warm([("hotel", "flight")], count=2)
+    checked_out = []
+    lock = threading.Lock()
+
+    def worker():
+        crew = pool.checkout(("hotel", "flight"))
+        with lock:
+            checked_out.append(crew)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(crew) for crew in checked_out}) == 8
+    assert len(built) == 8
+
+
+def test_idle_limit_and_failed_block_drop_crews():
+    pool, _ = make_pool(max_idle_per_shape=1)
+    pool.checkin(("hotel",), object())
+    pool.checkin(("hotel",), object())
+    assert pool.idle_count(("hotel",)) == 1
+
+    with pytest.raises(RuntimeError):
+        with pool.crew(("flight",)):
+            raise RuntimeError("kickoff failed")
+    assert pool.idle_count(("flight",)) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
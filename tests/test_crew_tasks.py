@@ -0,0 +1,36 @@
+import contextvars
+import os
+import sys
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import crew_tasks module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crew_tasks import TravelTask
+
+
+def test_failed_async_task_fails_its_future():
+    task = TravelTask(description="Book a flight", expected_output="Confirmation")
+    future = Future()
+    with patch.object(TravelTask, "_execute_core", side_effect=RuntimeError("booking service down")):
+        task._execute_task_async(None, None, None, future)
+    with pytest.raises(RuntimeError, match="booking service down"):
+        future.result(timeout=1)
+
+
+def test_async_task_runs_in_the_callers_context():
+    scope = contextvars.ContextVar("scope", default=None)
+    task = TravelTask(description="Book a flight", expected_output="Confirmation")
+    token = scope.set("request-1")
+    try:
+        with patch.object(TravelTask, "_execute_core", side_effect=lambda *args: scope.get()):
+            assert task.execute_async().result(timeout=1) == "request-1"
+    finally:
+        scope.reset(token)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
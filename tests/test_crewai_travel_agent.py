@@ -4,7 +4,6 @@ This test file uses MonocleValidator to trace test execution
 and send results to Okahu portal.
 """
 
-from asyncio import sleep
 import os
 import sys
 import pytest 
@@ -14,7 +13,7 @@ from dotenv import load_dotenv
 # Add parent directory to path to import crewai_travel_agent module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from crewai_travel_agent import execute_crewai_travel_request_async
+from crewai_travel_agent import execute_crewai_travel_request_async, flush_telemetry
 from monocle_test_tools import TestCase, MonocleValidator
 
 OKAHU_API_KEY = os.environ.get('OKAHU_API_KEY')
@@ -197,7 +196,7 @@ agent_test_cases: list[TestCase] = [
 @MonocleValidator().monocle_testcase(agent_test_cases)
 async def test_run_agents(my_test_case: TestCase):
     await MonocleValidator().test_workflow_async(execute_crewai_travel_request_async, my_test_case)
-    await sleep(2)  # Ensure all telemetry is flushed
+    flush_telemetry()  # Export every queued span before the next test case
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,4 +1,3 @@
-from asyncio import sleep
 import os
 import sys
 import pytest
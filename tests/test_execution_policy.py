@@ -0,0 +1,183 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to import execution_policy module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from booking_backends import SimulatedBookingBackend, get_booking_backend, set_booking_backend
+from execution_policy import AgentGuard, RequestBudget, RequestBudgetExceeded
+
+# Steps as CrewAI's executor reports them
+ACTION = SimpleNamespace(thought="", tool="book_flight", tool_input="{}", text="Action: book_flight")
+TOOL_RESULT = SimpleNamespace(result="{'status': 'success'}", result_as_answer=False)
+FINAL_TOOL_RESULT = SimpleNamespace(result="Flight booked.", result_as_answer=True)
+FINISH = SimpleNamespace(thought="", output="Flight booked.", text="Final Answer: Flight booked.")
+
+
+def watched_agent(guard):
+    agent = SimpleNamespace(step_callback=None, tools_results=[], _times_executed=0, max_retry_limit=2, llm=None,
+                            agent_executor=SimpleNamespace(task=None))
+    guard.watch(agent)
+    return agent
+
+
+@pytest.fixture
+def simulated_backend():
+    previous = get_booking_backend()
+    set_booking_backend(SimulatedBookingBackend(latency=0))
+    yield
+    set_booking_backend(previous)
+
+
+def test_budget_counts_llm_calls_and_time():
+    now = [0.0]
+    budget = RequestBudget(max_llm_calls=2, max_seconds=10, clock=lambda: now[0])
+    budget.spend_llm_call()
+    assert budget.exceeded() is None
+    now[0] = 10
+    assert "10 seconds" in budget.exceeded()
+    assert RequestBudget(max_llm_calls=1).exceeded() is None
+    unlimited = RequestBudget()
+    for _ in range(100):
+        unlimited.spend_llm_call()
+    assert unlimited.exceeded() is None
+
+
+def test_agent_is_stopped_once_the_budget_is_spent():
+    guard = AgentGuard()
+    agent = watched_agent(guard)
+    budget = RequestBudget(max_llm_calls=2)
+    guard.start(budget)
+
+    agent.step_callback(ACTION)
+    agent.step_callback(TOOL_RESULT)
+    assert budget.llm_calls == 1
+    with pytest.raises(RequestBudgetExceeded, match="2 of 2 LLM calls"):
+        agent.step_callback(ACTION)
+    # CrewAI would otherwise retry the task into the same budget
+    assert agent._times_executed == agent.max_retry_limit
+
+
+def test_step_that_finishes_its_task_is_let_through():
+    guard = AgentGuard()
+    agent = watched_agent(guard)
+    guard.start(RequestBudget(max_llm_calls=1))
+    agent.step_callback(FINAL_TOOL_RESULT)
+    agent.step_callback(FINISH)
+
+
+def test_start_clears_per_request_agent_state_and_stop_lifts_the_budget():
+    guard = AgentGuard()
+    agent = watched_agent(guard)
+    agent.tools_results.append({"result": "earlier request", "result_as_answer": True})
+    agent._times_executed = 3
+    guard.start(RequestBudget(max_llm_calls=0))
+    assert agent.tools_results == [] and agent._times_executed == 0
+
+    guard.stop()
+    agent.step_callback(ACTION)
+
+
+def test_identical_successful_calls_are_recalled_within_a_request():
+    guard = AgentGuard()
+    guard.start(None)
+    guard.remember("book_hotel", {"hotel_name": "Marriott", "city": "Mumbai"}, {"status": "success", "message": "ok"})
+    guard.remember("book_flight", {"from_airport": "JFK"}, {"status": "error", "message": "down"})
+
+    assert guard.recall("book_hotel", {"city": " mumbai", "hotel_name": "MARRIOTT"})["message"] == "ok"
+    assert guard.recall("book_hotel", {"hotel_name": "Hilton", "city": "Mumbai"}) is None
+    assert guard.recall("book_flight", {"from_airport": "JFK"}) is None
+    guard.start(None)
+    assert guard.recall("book_hotel", {"hotel_name": "Marriott", "city": "Mumbai"}) is None
+
+
+def test_booking_tool_books_a_repeated_call_once(simulated_backend):
+    from booking_tools import BookFlightsTool, BookFlightTool
+
+    events = []
+    guard = AgentGuard()
+    guard.start(None)
+    tool = BookFlightTool(events=SimpleNamespace(emit=lambda event, data: events.append(data)), guard=guard)
+    first = tool.run(from_airport="JFK", to_airport="LAX", date="next week")
+    again = tool.run(from_airport="jfk", to_airport="LAX", date="next week")
+
+    assert again == first
+    assert len(events) == 1
+    batch = BookFlightsTool(guard=guard)
+    reservations = [{"from_airport": "JFK", "to_airport": "LAX", "date": "next week"},
+                    {"from_airport": "LAX", "to_airport": "JFK", "date": "next month"}]
+    assert batch.run(reservations=reservations) == batch.run(reservations=reservations)
+
+
+def test_successful_booking_becomes_the_final_answer_only_when_enabled(simulated_backend):
+    from booking_tools import BookHotelTool
+
+    tool = BookHotelTool(answer_on_success=True)
+    structured = tool.to_structured_tool()
+    assert structured.result_as_answer is False
+    answer = tool.run(hotel_name="Marriott", city="Mumbai", check_in_date="next week", nights=2)
+    assert isinstance(answer, str) and "Marriott" in answer
+    assert structured.result_as_answer is True
+
+    plain = BookHotelTool()
+    assert plain.run(hotel_name="Marriott", city="Mumbai", check_in_date="next week")["status"] == "success"
+    assert plain.to_structured_tool().result_as_answer is False
+
+
+def test_only_tool_errors_of_the_current_request_escalate():
+    guard = AgentGuard()
+    task = SimpleNamespace(tools_errors=0)
+    agent = SimpleNamespace(role="Hotel Booking Agent", step_callback=None, tools_results=[], _times_executed=0,
+                            max_retry_limit=2, llm="weak", agent_executor=SimpleNamespace(task=task, llm="weak"))
+    strong = SimpleNamespace(model="strong")
+    guard.watch(agent, strong)
+
+    guard.start(None)
+    agent.step_callback(TOOL_RESULT)
+    assert agent.llm == "weak"
+    task.tools_errors = 1
+    agent.step_callback(TOOL_RESULT)
+    assert agent.llm is strong and agent.agent_executor.llm is strong
+
+    # The next request starts on the cheap model and does not count the earlier error
+    guard.start(None)
+    assert agent.llm == "weak"
+    agent.agent_executor.llm = "weak"
+    agent.step_callback(TOOL_RESULT)
+    assert agent.llm == "weak"
+
+
+def test_specialist_escalates_after_a_failed_tool_call_and_recovers_next_request(simulated_backend):
+    from crewai import Agent, Crew, Task
+    from booking_tools import BookFlightTool
+    from crew_events import CrewEvents
+    from mock_llm import MockLLM
+
+    events = CrewEvents()
+    emitted = []
+    events.attach(lambda event, data: emitted.append((event, data)))
+    guard = AgentGuard(events)
+    weak = MockLLM(model="mock/weak", invalid_tool_call_rate=1.0)
+    agent = Agent(role="Flight Booking Agent", goal="Book flights", backstory="You book flights.",
+                  tools=[BookFlightTool(events=events, guard=guard)], llm=weak, max_iter=4)
+    strong = MockLLM(model="mock/strong")
+    guard.watch(agent, strong)
+    task = Task(description="Book a flight.\nArguments already extracted for book_flight: "
+                            "from_airport=JFK, to_airport=LAX, date=next week",
+                expected_output="Flight booking confirmation", agent=agent)
+    crew = Crew(agents=[agent], tasks=[task], cache=False)
+
+    guard.start(RequestBudget())
+    result = crew.kickoff()
+    guard.stop()
+
+    assert str(result) == "Flight booked from JFK to LAX for next week."
+    assert ("escalation", {"agent": "Flight Booking Agent", "model": "mock/strong"}) in emitted
+    assert agent.llm is weak
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
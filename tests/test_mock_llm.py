@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import mock_llm module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mock_llm import LatencyModel, MockLLM
+
+HOTEL_SYSTEM_PROMPT = ("You are Hotel Booking Agent.\nTool Name: book_hotel\nTool Arguments: {...}\n"
+                       "Tool Name: book_hotels\nTool Arguments: {...}")
+HOTEL_TASK = ("Current Task: Extract hotel booking details from this request and book accordingly: "
+              "Book a Marriott hotel in New York for 3 nights\n"
+              "Arguments already extracted for book_hotel (use them as given, only work out the ones not given): "
+              "hotel_name=Marriott, city=New York, check_in_date=not given, nights=3")
+
+
+def test_specialist_calls_its_tool_with_extracted_arguments():
+    llm = MockLLM()
+    reply = llm.call([{"role": "system", "content": HOTEL_SYSTEM_PROMPT}, {"role": "user", "content": HOTEL_TASK}])
+
+    assert "Action: book_hotel" in reply
+    action_input = json.loads(reply.split("Action Input:", 1)[1])
+    assert action_input == {"hotel_name": "Marriott", "city": "New York", "check_in_date": "next week", "nights": 3}
+
+
+def test_specialist_finishes_with_tool_confirmation():
+    llm = MockLLM()
+    observation = ("Action: book_hotel\nObservation: {'status': 'success', 'message': "
+                   "'Successfully booked a stay at Marriott in New York from next week for 3 nights.'}")
+    reply = llm.call([
+        {"role": "system", "content": HOTEL_SYSTEM_PROMPT},
+        {"role": "user", "content": HOTEL_TASK},
+        {"role": "assistant", "content": observation},
+    ])
+
+    assert reply.endswith("Final Answer: Successfully booked a stay at Marriott in New York from next week for 3 nights.")
+
+
+def test_call_count_and_latency_models():
+    before = MockLLM.call_count()
+    MockLLM(latency="fixed:0").call("Tool Name: book_flight\nTool Name: book_hotel")
+    assert MockLLM.call_count() == before + 1
+
+    assert LatencyModel("fixed:0.25").sample() == 0.25
+    assert 0.1 <= LatencyModel("uniform:0.1,0.2", seed=1).sample() <= 0.2
+    assert LatencyModel("lognormal:0.5,0.3", seed=1).sample() > 0
+    with pytest.raises(ValueError):
+        LatencyModel("gaussian:1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to import prompt_budget module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import prompt_budget
+from prompt_budget import count_tokens, fit_request, task_prompt_tokens
+
+CHATTY_REQUEST = (
+    "Hi there, I hope you are having a wonderful day and that the weather is nice where you are. "
+    "My family and I have been planning this vacation for a very long time and we are so excited about it. "
+    "Please book a flight from JFK to LAX next week.\n"
+    "We also love trying new restaurants and visiting museums whenever we travel anywhere new. "
+    "And book a Marriott hotel in Los Angeles for 3 nights. "
+    "Thanks so much in advance, you are the best and we really appreciate all of your help!"
+)
+
+
+def test_short_request_only_loses_extra_whitespace():
+    assert fit_request("Book a flight  from JFK\nto LAX", 256) == "Book a flight from JFK to LAX"
+
+
+def test_long_request_keeps_the_sentences_with_booking_details():
+    fitted = fit_request(CHATTY_REQUEST, 40)
+
+    assert fitted == ("Please book a flight from JFK to LAX next week. "
+                      "And book a Marriott hotel in Los Angeles for 3 nights.")
+    assert count_tokens(fitted) <= 40 < count_tokens(CHATTY_REQUEST)
+
+
+def test_request_is_cut_at_the_budget_when_details_do_not_fit():
+    fitted = fit_request(CHATTY_REQUEST, 8)
+
+    assert fitted.startswith("Please book a flight") and fitted.endswith(" ...")
+    assert count_tokens(fitted) <= 8 + count_tokens(" ...")
+
+
+def test_character_estimate_without_a_tiktoken_encoding(monkeypatch):
+    # tiktoken installed, but its encoding file could not be downloaded
+    monkeypatch.setattr(prompt_budget, "_encoding", lambda: None)
+
+    assert count_tokens("Book a flight") == 4
+    assert fit_request("Book a flight from JFK to LAX", 8) == "Book a flight from JFK to LAX"
+    assert fit_request("Please book a flight from JFK to LAX next week.", 5) == "Please book a flight ..."
+
+
+def test_task_prompt_tokens_counts_agent_task_and_context():
+    agent = SimpleNamespace(role="Flight Booking Agent", goal="Book flights", backstory="An expert.",
+                            tools=[SimpleNamespace(description="Book a flight reservation")])
+    flight_task = SimpleNamespace(name="Flight Booking Task", agent=agent, description="Book JFK to LAX",
+                                  expected_output="Confirmation", context=None,
+                                  output=SimpleNamespace(raw="Flight booked from JFK to LAX for next week."))
+    summary_task = SimpleNamespace(name="Travel Coordination Task", agent=agent, description="Summarize",
+                                   expected_output="Summary", context=[flight_task], output=None)
+
+    report = task_prompt_tokens([flight_task, summary_task])
+
+    assert report["Flight Booking Task"] == count_tokens(
+        "Book JFK to LAX\nConfirmation\nFlight Booking Agent\nBook flights\nAn expert.\nBook a flight reservation")
+    assert report["Travel Coordination Task"] > count_tokens("Flight booked from JFK to LAX for next week.")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import request_corpus module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from request_corpus import load_travel_requests
+
+
+def test_accepts_request_and_body_fields(tmp_path):
+    corpus = tmp_path / "requests.jsonl"
+    corpus.write_text("\n".join([
+        json.dumps({"request": "Book a flight from JFK to LAX"}),
+        "",
+        json.dumps({"request_id": "user-7", "title": "Hotel", "body": "Book a Marriott hotel in New York"}),
+    ]))
+
+    assert load_travel_requests(corpus) == [
+        {"id": "1", "request": "Book a flight from JFK to LAX"},
+        {"id": "user-7", "request": "Book a Marriott hotel in New York"},
+    ]
+
+
+def test_rejects_lines_without_request_text(tmp_path):
+    corpus = tmp_path / "requests.jsonl"
+    corpus.write_text(json.dumps({"title": "nothing to book"}))
+
+    with pytest.raises(ValueError, match="requests.jsonl:1"):
+        load_travel_requests(corpus)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import request_metrics module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from request_metrics import STAGE_SECONDS, TOOL_SECONDS, Histogram, RequestReport
+
+
+def test_report_records_stages_tools_and_usage():
+    routes_before = STAGE_SECONDS.count("route")
+    tools_before = TOOL_SECONDS.count("book_flight", "success")
+    report = RequestReport()
+    with report.stage("route"):
+        pass
+    report.record_tool("book_flight", 0.2, "success")
+    report.record_task("Flight Booking Task", 1.5)
+    report.record_task("Hotel Booking Task", None)
+    report.record_usage(3, 1200, 150)
+    summary = report.finish().as_dict()
+
+    assert set(summary["stages"]) == {"route"}
+    assert summary["tasks"] == {"Flight Booking Task": 1.5}
+    assert summary["tools"] == [{"tool": "book_flight", "seconds": 0.2, "status": "success"}]
+    assert (summary["llm_calls"], summary["prompt_tokens"], summary["completion_tokens"]) == (3, 1200, 150)
+    assert summary["total_seconds"] >= summary["stages"]["route"]
+    assert STAGE_SECONDS.count("route") == routes_before + 1
+    assert TOOL_SECONDS.count("book_flight", "success") == tools_before + 1
+
+
+def test_stage_is_recorded_when_it_raises():
+    report = RequestReport()
+    with pytest.raises(RuntimeError):
+        with report.stage("kickoff"):
+            raise RuntimeError("LLM unavailable")
+    assert "kickoff" in report.stages
+
+
+def test_histogram_renders_prometheus_text():
+    histogram = Histogram("demo_seconds", "Demo latency", ("stage",), buckets=(0.1, 1))
+    histogram.observe(0.05, "route")
+    histogram.observe(0.5, "route")
+
+    assert histogram.render().splitlines() == [
+        "# HELP demo_seconds Demo latency",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{stage="route",le="0.1"} 1',
+        'demo_seconds_bucket{stage="route",le="1"} 2',
+        'demo_seconds_bucket{stage="route",le="+Inf"} 2',
+        'demo_seconds_sum{stage="route"} 0.55',
+        'demo_seconds_count{stage="route"} 2',
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
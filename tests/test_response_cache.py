@@ -0,0 +1,95 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path to import response_cache module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from response_cache import ResponseCache, cache_key
+from travel_router import route_travel_request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def factory(**kwargs):
+        sqlite_path = str(tmp_path / "responses.db") if request.param == "sqlite" else None
+        return ResponseCache(sqlite_path=sqlite_path, **kwargs)
+    return factory
+
+
+def test_near_identical_requests_share_a_key():
+    first = "Book a flight from JFK to LAX on 2026-05-01"
+    second = "  book a flight   from JFK to LAX on 2026-05-01! "
+    reworded = "Please fly me from JFK to LAX on 2026-05-01"
+
+    assert cache_key(first, route_travel_request(first), "session-a") == \
+        cache_key(second, route_travel_request(second), "session-a")
+    assert cache_key(first, route_travel_request(first), "session-a") == \
+        cache_key(reworded, route_travel_request(reworded), "session-a")
+    assert cache_key(first, route_travel_request(first), "session-a") != \
+        cache_key(first, route_travel_request(first), "session-b")
+
+
+def test_ttl_and_lru_eviction(make_cache):
+    clock = FakeClock()
+    cache = make_cache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", "A")
+    clock.now += 1
+    cache.put("b", "B")
+    clock.now += 1
+    assert cache.get("a") == "A"  # "b" is now least recently used
+    clock.now += 1
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2}
+
+
+def test_concurrent_duplicates_book_once(make_cache):
+    cache = make_cache()
+    bookings = []
+
+    def book():
+        time.sleep(0.05)
+        bookings.append(1)
+        return "Flight booked from JFK to LAX."
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", book))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(bookings) == 1
+    assert results == ["Flight booked from JFK to LAX."] * 5
+    assert cache.stats() == {"hits": 4, "misses": 1}
+
+
+def test_failures_are_not_cached(make_cache):
+    cache = make_cache()
+
+    def fail():
+        raise RuntimeError("booking backend down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", fail)
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import session_memory module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from session_memory import MAX_CONFIRMATIONS, SessionState, SessionStore
+from travel_router import FLIGHT_SERVICE, HOTEL_SERVICE, route_travel_request
+
+MARRIOTT = {"tool": "book_hotel", "status": "success",
+            "booking": {"hotel_name": "Marriott", "city": "New York", "check_in_date": "next week", "nights": 3},
+            "message": "Successfully booked a stay at Marriott in New York from next week for 3 nights."}
+
+
+def first_turn() -> SessionState:
+    intent = route_travel_request("Book a Marriott hotel in New York for 3 nights next week")
+    return SessionState().record(intent, [MARRIOTT])
+
+
+def test_follow_up_keeps_earlier_details_and_reports_the_change():
+    session = first_turn()
+    intent = session.apply(route_travel_request("Actually, make it 5 nights"))
+
+    assert intent.services == (HOTEL_SERVICE,)
+    assert intent.hotel_slots.as_tool_args() == {"hotel_name": "Marriott", "city": "New York",
+                                                 "check_in_date": "next week", "nights": 5}
+    assert session.describe(HOTEL_SERVICE, intent.hotel_slots) == (
+        "already booked hotel_name=Marriott, city=New York, check_in_date=next week, nights=3; "
+        "this turn changes nights=5")
+    assert session.describe(FLIGHT_SERVICE, intent.flight_slots) == "none"
+
+
+def test_turn_without_a_service_refers_to_the_previous_one():
+    intent = first_turn().apply(route_travel_request("Can you move it to June 5?"))
+
+    assert intent.services == (HOTEL_SERVICE,)
+    assert intent.check_in_date == "June 5" and intent.nights == 3
+
+
+def test_different_booking_does_not_inherit_the_earlier_one():
+    session = first_turn()
+    hilton = session.apply(route_travel_request("Also book a Hilton hotel in Chicago"))
+
+    assert hilton.hotel_slots.as_tool_args() == {"hotel_name": "Hilton", "city": "Chicago",
+                                                 "check_in_date": None, "nights": None}
+    assert session.describe(HOTEL_SERVICE, hilton.hotel_slots) == "none"
+
+    flown = session.record(route_travel_request("Book a flight from JFK to LAX on June 5"),
+                           [{"tool": "book_flight", "status": "success",
+                             "booking": {"from_airport": "JFK", "to_airport": "LAX", "date": "June 5"}}])
+    assert flown.apply(route_travel_request("Book a flight from Boston to Miami")).flight_date is None
+    assert flown.apply(route_travel_request("Book the flight from JFK to LAX")).flight_date == "June 5"
+
+
+def test_new_session_leaves_the_intent_alone():
+    intent = route_travel_request("Book a flight from JFK to LAX")
+    assert SessionState().apply(intent) == intent
+    assert SessionState().describe(FLIGHT_SERVICE, intent.flight_slots) == "none"
+
+
+def test_state_stays_compact():
+    intent = route_travel_request("Book a flight from JFK to LAX")
+    session = SessionState()
+    for n in range(10):
+        session = session.record(intent, [{"tool": "book_flight", "status": "error", "message": f"failed {n}"}])
+
+    assert session.turns == 10
+    assert session.flight == {}
+    assert session.confirmations == [f"failed {n}" for n in range(10 - MAX_CONFIRMATIONS, 10)]
+
+
+def test_store_is_a_bounded_lru_with_ttl():
+    now = [0.0]
+    store = SessionStore(max_sessions=2, ttl_seconds=60, clock=lambda: now[0])
+    store.put("a", first_turn())
+    store.put("b", first_turn())
+    store.get("a")
+    store.put("c", first_turn())
+
+    assert len(store) == 2
+    assert store.get("b").turns == 0
+    assert store.get("a").turns == 1
+    now[0] = 61
+    assert store.get("c").turns == 0
+
+
+def test_sqlite_store_survives_reopening(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    SessionStore(sqlite_path=path).put("traveler-7", first_turn())
+
+    assert SessionStore(sqlite_path=path).get("traveler-7") == first_turn()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_import_defers_crewai_and_telemetry():
+    # A fresh interpreter, so modules imported by other tests do not count
+    script = ("import sys, crewai_travel_agent\n"
+              "heavy = sorted({name.split('.')[0] for name in sys.modules} & "
+              "{'crewai', 'langchain_openai', 'litellm', 'monocle_apptrace'})\n"
+              "print(','.join(heavy))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+import random
+import sys
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+# Add parent directory to path to import telemetry module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telemetry import RotatingFileSpanExporter, TailSamplingSpanProcessor, TelemetrySettings
+
+
+def tracer_with(processor):
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    return provider.get_tracer("test")
+
+
+def run_trace(tracer, fail=False):
+    with tracer.start_as_current_span("agentic.turn"):
+        with tracer.start_as_current_span("agentic.tool.invocation") as tool_span:
+            if fail:
+                tool_span.set_status(Status(StatusCode.ERROR))
+
+
+def test_tail_sampler_keeps_failed_traces_whole_and_samples_the_rest():
+    exporter = InMemorySpanExporter()
+    sampler = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), sample_rate=0.0, rng=random.Random(0))
+    tracer = tracer_with(sampler)
+
+    run_trace(tracer)
+    run_trace(tracer, fail=True)
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["agentic.tool.invocation", "agentic.turn"]
+    assert (sampler.kept_traces, sampler.dropped_traces) == (1, 1)
+
+
+def test_tail_sampler_keeps_slow_traces():
+    exporter = InMemorySpanExporter()
+    tracer = tracer_with(TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), sample_rate=0.0,
+                                                   slow_trace_seconds=0.0))
+    run_trace(tracer)
+    assert len(exporter.get_finished_spans()) == 2
+
+
+def test_file_exporter_rotates_and_compresses(tmp_path):
+    exporter = RotatingFileSpanExporter(str(tmp_path), max_bytes=1, backups=2)
+    tracer = tracer_with(SimpleSpanProcessor(exporter))
+    for _ in range(3):
+        run_trace(tracer)
+    exporter.shutdown()
+
+    assert sorted(os.listdir(tmp_path)) == ["traces.1.jsonl.gz", "traces.2.jsonl.gz", "traces.jsonl"]
+    with gzip.open(tmp_path / "traces.1.jsonl.gz", "rt") as archive:
+        assert json.loads(archive.readline())["name"] == "agentic.turn"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TelemetrySettings(mode="verbose")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
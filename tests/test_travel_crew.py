@@ -0,0 +1,205 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path to import crewai_travel_agent module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import crewai_travel_agent
+from booking_backends import SimulatedBookingBackend, get_booking_backend, set_booking_backend
+from crew_pool import CrewPool
+from crewai_travel_agent import (TravelAgentConfig, abook_with_tools, book_with_tools, build_crewai_travel_crew,
+                                 create_crewai_travel_crew, execute_crewai_travel_request,
+                                 execute_crewai_travel_request_async)
+from request_metrics import REQUEST_SECONDS, STAGE_SECONDS
+from response_cache import ResponseCache
+from session_memory import SessionStore
+from travel_router import route_travel_request
+
+COMBINED_REQUEST = ("Book a flight from JFK to LAX on June 5. "
+                    "Book a Marriott hotel in Los Angeles on June 5 for 3 nights.")
+
+
+class RecordingBackend(SimulatedBookingBackend):
+    """Simulated backend that records every booking it is asked to make."""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.bookings = []
+        self._lock = threading.Lock()
+
+    def book_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        with self._lock:
+            self.bookings.append(("hotel", idempotency_key))
+        return super().book_hotel(hotel_name, city, check_in_date, nights, idempotency_key)
+
+    def book_flight(self, from_airport, to_airport, date, idempotency_key):
+        with self._lock:
+            self.bookings.append(("flight", idempotency_key))
+        return super().book_flight(from_airport, to_airport, date, idempotency_key)
+
+    async def abook_hotel(self, hotel_name, city, check_in_date, nights, idempotency_key):
+        self.bookings.append(("hotel", idempotency_key))
+        return await super().abook_hotel(hotel_name, city, check_in_date, nights, idempotency_key)
+
+    async def abook_flight(self, from_airport, to_airport, date, idempotency_key):
+        self.bookings.append(("flight", idempotency_key))
+        return await super().abook_flight(from_airport, to_airport, date, idempotency_key)
+
+
+@pytest.fixture
+def mock_crews(monkeypatch):
+    """Pooled crews on the mock LLM, booking through a ``RecordingBackend``."""
+    monkeypatch.setattr(crewai_travel_agent, "_active_config", TravelAgentConfig(telemetry=False, preload=False))
+    monkeypatch.setattr(crewai_travel_agent, "MOCK_LLM", True)
+    monkeypatch.setattr(crewai_travel_agent, "crew_pool", CrewPool(build_crewai_travel_crew))
+    previous = get_booking_backend()
+    backend = RecordingBackend()
+    set_booking_backend(backend)
+    yield backend
+    set_booking_backend(previous)
+
+
+def test_combined_request_runs_specialists_in_parallel(mock_crews):
+    hotel_task, flight_task, supervisor_task = build_crewai_travel_crew(("hotel", "flight")).crew.tasks
+
+    assert hotel_task.async_execution and flight_task.async_execution
+    assert not supervisor_task.async_execution
+    assert supervisor_task.context == [hotel_task, flight_task]
+
+
+def test_parallel_tasks_can_be_turned_off(mock_crews, monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "PARALLEL_SPECIALIST_TASKS", False)
+    hotel_task, flight_task, supervisor_task = build_crewai_travel_crew(("hotel", "flight")).crew.tasks
+
+    assert not hotel_task.async_execution and not flight_task.async_execution
+    assert supervisor_task.context == [hotel_task, flight_task]
+
+
+def test_single_service_crew_has_no_supervisor_task(mock_crews):
+    for shape, task_name in [(("hotel",), "Hotel Booking Task"), (("flight",), "Flight Booking Task")]:
+        tasks = build_crewai_travel_crew(shape).crew.tasks
+        assert [task.name for task in tasks] == [task_name]
+        assert not tasks[0].async_execution
+
+
+def test_supervisor_task_can_always_run(mock_crews, monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "ALWAYS_RUN_SUPERVISOR", True)
+    flight_task, supervisor_task = build_crewai_travel_crew(("flight",)).crew.tasks
+
+    assert flight_task.name == "Flight Booking Task"
+    assert supervisor_task.name == "Travel Coordination Task"
+    assert supervisor_task.context == [flight_task]
+
+
+def test_created_crew_can_be_kicked_off_with_inputs(mock_crews):
+    travel_request = "Book a flight from JFK to LAX for next week."
+    crew = create_crewai_travel_crew(travel_request)
+    result = crew.kickoff(inputs={"request": travel_request})
+
+    assert str(result) == "Flight booked from JFK to LAX for next week."
+    assert "JFK" in crew.tasks[0].description
+
+
+def test_repeated_request_on_a_pooled_crew_books_every_time(mock_crews):
+    execute_crewai_travel_request(COMBINED_REQUEST)
+    assert sorted(kind for kind, _ in mock_crews.bookings) == ["flight", "hotel"]
+
+    execute_crewai_travel_request(COMBINED_REQUEST)
+    assert sorted(kind for kind, _ in mock_crews.bookings) == ["flight", "flight", "hotel", "hotel"]
+    assert crewai_travel_agent.crew_pool.idle_count(("hotel", "flight")) == 1
+
+
+def test_response_cache_only_answers_repeats_with_the_same_idempotency_key(mock_crews, monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "response_cache", ResponseCache())
+    travel_request = "Book a Marriott hotel in New York on June 5 for 3 nights."
+    for idempotency_key in (None, None, "traveler-1", "traveler-1", "traveler-2"):
+        execute_crewai_travel_request(travel_request, idempotency_key=idempotency_key)
+
+    assert len(mock_crews.bookings) == 4
+
+
+def test_parallel_tasks_keep_the_request_idempotency_scope(mock_crews, monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "PARALLEL_SPECIALIST_TASKS", True)
+    execute_crewai_travel_request(COMBINED_REQUEST, idempotency_key="retry-1")
+    execute_crewai_travel_request(COMBINED_REQUEST, idempotency_key="retry-1")
+    first, retry = sorted(mock_crews.bookings[:2]), sorted(mock_crews.bookings[2:])
+
+    assert first == retry
+    execute_crewai_travel_request(COMBINED_REQUEST, idempotency_key="retry-2")
+    assert not set(mock_crews.bookings[4:]) & set(first)
+
+
+def test_direct_booking_books_complete_slots(mock_crews):
+    intent = route_travel_request(COMBINED_REQUEST)
+    assert intent.has_complete_slots()
+
+    assert "JFK" in book_with_tools(intent)
+    assert "JFK" in asyncio.run(abook_with_tools(intent))
+    assert sorted(kind for kind, _ in mock_crews.bookings) == ["flight", "flight", "hotel", "hotel"]
+
+
+@pytest.mark.parametrize("travel_request", [
+    "Book flights from Boston to Paris on May 3 and from Paris to Rome on May 6",
+    "Book the Hilton in Paris on May 3 for 2 nights and the Marriott in Rome on May 6 for 3 nights",
+    "Book a Marriott hotel in Paris from May 3 to May 6",
+    "Book a Marriott hotel in Paris on May 3",
+])
+def test_direct_booking_refuses_what_the_slots_cannot_hold(mock_crews, travel_request):
+    intent = route_travel_request(travel_request)
+    assert not intent.has_complete_slots()
+
+    with pytest.raises(ValueError):
+        book_with_tools(intent)
+    with pytest.raises(ValueError):
+        asyncio.run(abook_with_tools(intent))
+    assert mock_crews.bookings == []
+
+
+def test_direct_tool_calls_leave_a_multi_leg_request_to_the_crew(mock_crews, monkeypatch):
+    monkeypatch.setattr(crewai_travel_agent, "DIRECT_TOOL_CALLS", True)
+    stages = []
+    execute_crewai_travel_request(
+        "Book flights from Boston to Paris on May 3 and from Paris to Rome on May 6",
+        event_sink=lambda event, data: stages.extend(data["stages"]) if event == "report" else None)
+
+    assert "kickoff" in stages and "direct_booking" not in stages
+
+
+class ThreadRecordingSessionStore(SessionStore):
+    """Session store that records the thread of every read and write."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, session_id):
+        self.threads.append(threading.current_thread())
+        return super().get(session_id)
+
+    def put(self, session_id, state):
+        self.threads.append(threading.current_thread())
+        super().put(session_id, state)
+
+
+@pytest.mark.parametrize("travel_request", [
+    "Book a flight from JFK to LAX on June 5",
+    "Book a flight from JFK to LAX next week, then from LAX to SFO",
+])
+@pytest.mark.parametrize("direct_tool_calls", [False, True])
+def test_async_request_is_routed_once_off_the_event_loop(mock_crews, monkeypatch, travel_request, direct_tool_calls):
+    monkeypatch.setattr(crewai_travel_agent, "DIRECT_TOOL_CALLS", direct_tool_calls)
+    store = ThreadRecordingSessionStore()
+    monkeypatch.setattr(crewai_travel_agent, "session_store", store)
+    requests, routes = REQUEST_SECONDS.count(), STAGE_SECONDS.count("route")
+    asyncio.run(execute_crewai_travel_request_async(travel_request, session_id="traveler-7"))
+
+    assert (REQUEST_SECONDS.count() - requests, STAGE_SECONDS.count("route") - routes) == (1, 1)
+    assert len(store.threads) == 2 and threading.main_thread() not in store.threads
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
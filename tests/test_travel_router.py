@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to import travel_router module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from travel_router import FLIGHT_SERVICE, HOTEL_SERVICE, route_travel_request
+
+CORPUS_PATH = Path(__file__).parent / "data" / "router_corpus.jsonl"
+ROUTER_CORPUS = [json.loads(line) for line in CORPUS_PATH.read_text().splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("case", ROUTER_CORPUS, ids=lambda case: case["request"][:40])
+def test_routes_labeled_corpus(case):
+    intent = route_travel_request(case["request"])
+    assert list(intent.services) == case["services"]
+    if "hotel_name" in case:
+        assert intent.hotel_name == case["hotel_name"]
+
+
+def test_substrings_do_not_trigger_services():
+    assert route_travel_request("The bathroom is flooded").services == ()
+    assert route_travel_request("I want to travel to Paris").services == ()
+
+
+def test_request_without_a_service_falls_back_to_every_service():
+    intent = route_travel_request("I want to travel to Paris").or_all_services()
+    assert intent.services == (HOTEL_SERVICE, FLIGHT_SERVICE)
+    assert not intent.has_complete_slots()
+
+    hotel_only = route_travel_request("Book a Marriott hotel in New York for 3 nights")
+    assert hotel_only.or_all_services() is hotel_only
+
+
+def test_extracts_combined_booking_details():
+    intent = route_travel_request(
+        "Book a flight from San Francisco to Mumbai for 26th April 2026. Book a two queen room at "
+        "Marriott Intercontinental in Mumbai for 27th April 2026 for 4 nights.")
+
+    assert intent.needs_flight and intent.needs_hotel
+    assert (intent.origin, intent.destination) == ("San Francisco", "Mumbai")
+    assert (intent.hotel_name, intent.hotel_city) == ("Marriott Intercontinental", "Mumbai")
+    assert intent.dates == ("26th April 2026", "27th April 2026")
+    assert intent.nights == 4
+
+
+def test_hotel_city_falls_back_to_flight_destination():
+    intent = route_travel_request(
+        "I need to travel from New York to London on January 15th, 2026. "
+        "Please book me a flight and a hotel stay for five nights.")
+
+    assert intent.hotel_city == "London"
+    assert intent.dates == ("January 15th, 2026",)
+    assert intent.nights == 5
+
+
+def test_airport_code_pair_without_from():
+    intent = route_travel_request("Book me a flight BOS to SFO and a Marriott in San Francisco")
+
+    assert (intent.origin, intent.destination) == ("BOS", "SFO")
+    assert (intent.hotel_name, intent.hotel_city) == ("Marriott", "San Francisco")
+
+
+def test_booking_slots_follow_the_service_they_belong_to():
+    intent = route_travel_request(
+        "Book a flight from San Francisco to Mumbai for 26th March 2026. "
+        "Book a hotel at Marriott in Mumbai for 27th March 2026 for 4 nights.")
+
+    assert intent.flight_slots.as_tool_args() == {
+        "from_airport": "San Francisco", "to_airport": "Mumbai", "date": "26th March 2026"}
+    assert intent.hotel_slots.as_tool_args() == {
+        "hotel_name": "Marriott", "city": "Mumbai", "check_in_date": "27th March 2026", "nights": 4}
+    assert intent.has_complete_slots()
+
+
+def test_hotel_check_in_defaults_to_flight_date():
+    intent = route_travel_request("Fly from SFO to BOM next week and book a Marriott hotel in Mumbai.")
+
+    assert intent.hotel_slots.check_in_date == "next week"
+    assert intent.hotel_slots.nights is None
+
+
+def test_missing_slots_are_not_complete():
+    intent = route_travel_request("Book a flight from JFK to LAX")
+
+    assert intent.flight_slots.date is None
+    assert not intent.has_complete_slots()
+    assert intent.hotel_slots is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
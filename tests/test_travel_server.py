@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path to import travel_server module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from travel_server import MAX_BODY_BYTES, TravelAgentService, create_app
+
+
+async def call(app, method, path, payload=None, headers=()):
+    """Send one HTTP request through the ASGI app and return (status, headers, json body)."""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "headers": list(headers)}, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), json.loads(sent[1]["body"])
+
+
+async def call_stream(app, path, payload):
+    """POST to a streaming endpoint and return (status, list of (event, data)) from the SSE body."""
+    messages = [{"type": "http.request", "body": json.dumps(payload).encode(), "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": "POST", "path": path, "headers": []}, receive, send)
+    body = b"".join(message.get("body", b"") for message in sent[1:]).decode()
+    events = []
+    for block in filter(None, body.split("\n\n")):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return sent[0]["status"], events
+
+
+def make_app(handler, max_workers=1, max_queue=1, stream_handler=None):
+    service = TravelAgentService(handler, max_workers=max_workers, max_queue=max_queue,
+                                 stream_handler=stream_handler)
+    sessions = iter(f"session-{n}" for n in range(100))
+    return service, create_app(service, drain_timeout=1, session_id_factory=lambda: next(sessions))
+
+
+def test_booking_gets_its_own_session():
+    async def handler(travel_request, session_id, idempotency_key=None):
+        return f"booked {travel_request} in {session_id}"
+
+    async def scenario():
+        _, app = make_app(handler)
+        first = await call(app, "POST", "/bookings", {"request": "Book a flight from JFK to LAX"})
+        second = await call(app, "POST", "/bookings", {"request": "Book a flight from JFK to LAX",
+                                                       "session_id": "traveler-7"})
+        invalid = await call(app, "POST", "/bookings", {"request": "  "})
+        return first, second, invalid
+
+    first, second, invalid = asyncio.run(scenario())
+
+    assert first[0] == 200 and first[2] == {"session_id": "session-0",
+                                            "result": "booked Book a flight from JFK to LAX in session-0"}
+    assert second[2]["session_id"] == "traveler-7"
+    assert invalid[0] == 400
+
+
+def test_idempotency_key_comes_from_the_request_not_the_session():
+    keys = []
+
+    async def handler(travel_request, session_id, idempotency_key=None):
+        keys.append(idempotency_key)
+        return "booked"
+
+    async def scenario():
+        _, app = make_app(handler)
+        session = {"request": "Book a flight from JFK to LAX", "session_id": "traveler-7"}
+        await call(app, "POST", "/bookings", session)
+        await call(app, "POST", "/bookings", session, headers=[(b"idempotency-key", b"retry-1")])
+        await call(app, "POST", "/bookings", dict(session, idempotency_key="retry-2"))
+        return [(await call(app, "POST", "/bookings", dict(session, **invalid)))[0]
+                for invalid in ({"session_id": 7}, {"idempotency_key": ["retry-3"]})]
+
+    assert asyncio.run(scenario()) == [400, 400]
+    assert keys == [None, "retry-1", "retry-2"]
+
+
+def test_oversized_body_answers_413():
+    async def handler(travel_request, session_id, idempotency_key=None):
+        return "booked"
+
+    async def scenario():
+        _, app = make_app(handler)
+        return await call(app, "POST", "/bookings", {"request": "x" * (MAX_BODY_BYTES + 1)})
+
+    assert asyncio.run(scenario())[0] == 413
+
+
+def test_default_handler_runs_crews_on_the_service_executor(monkeypatch):
+    import crewai_travel_agent
+
+    def execute(travel_request, idempotency_key=None, event_sink=None, session_id=None):
+        return threading.current_thread().name, idempotency_key, session_id
+
+    monkeypatch.setattr(crewai_travel_agent, "_active_config", crewai_travel_agent.TravelAgentConfig(telemetry=False))
+    monkeypatch.setattr(crewai_travel_agent, "execute_crewai_travel_request", execute)
+
+    async def scenario():
+        service = TravelAgentService(max_workers=2)
+        return [await service.submit("Book a flight from JFK to LAX", "traveler-7"),
+                await service.submit("Book a flight from JFK to LAX", "traveler-7", "retry-1")]
+
+    (thread, first_key, session_id), (_, retry_key, _) = asyncio.run(scenario())
+    assert thread.startswith("travel-agent") and session_id == "traveler-7"
+    assert (first_key, retry_key) == (None, "retry-1")
+
+
+def test_saturated_service_answers_429():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def handler(travel_request, session_id, idempotency_key=None):
+            await release.wait()
+            return "done"
+
+        service, app = make_app(handler, max_workers=1, max_queue=1)
+        running = asyncio.create_task(call(app, "POST", "/bookings", {"request": "first"}))
+        waiting = asyncio.create_task(call(app, "POST", "/bookings", {"request": "second"}))
+        await asyncio.sleep(0.01)
+        health = await call(app, "GET", "/health")
+        rejected = await call(app, "POST", "/bookings", {"request": "third"})
+        release.set()
+        return health, rejected, await running, await waiting
+
+    health, rejected, running, waiting = asyncio.run(scenario())
+
+    assert health[2] == {"status": "ok", "in_flight": 1, "queued": 1}
+    assert rejected[0] == 429 and rejected[1][b"retry-after"] == b"1"
+    assert running[0] == waiting[0] == 200
+
+
+def test_drain_finishes_accepted_requests_and_rejects_new_ones():
+    async def scenario():
+        async def handler(travel_request, session_id, idempotency_key=None):
+            await asyncio.sleep(0.05)
+            return "done"
+
+        service, app = make_app(handler, max_workers=2)
+        accepted = asyncio.create_task(call(app, "POST", "/bookings", {"request": "first"}))
+        await asyncio.sleep(0.01)
+        drained = asyncio.create_task(service.drain(timeout=1))
+        await asyncio.sleep(0)
+        rejected = await call(app, "POST", "/bookings", {"request": "late"})
+        return await accepted, rejected, await drained
+
+    accepted, rejected, drained = asyncio.run(scenario())
+
+    assert accepted[0] == 200
+    assert rejected[0] == 503
+    assert drained is True
+
+
+def test_stream_sends_progress_events_then_result():
+    async def stream_handler(travel_request, session_id, idempotency_key=None):
+        yield {"event": "booking", "data": {"tool": "book_flight", "status": "success"}}
+        yield {"event": "result", "data": {"result": f"booked {travel_request}"}}
+
+    async def scenario():
+        service, app = make_app(None, stream_handler=stream_handler)
+        streamed = await call_stream(app, "/bookings/stream", {"request": "Book a flight from JFK to LAX"})
+        return streamed, service.in_flight
+
+    (status, events), in_flight = asyncio.run(scenario())
+
+    assert status == 200
+    assert events == [
+        ("session", {"session_id": "session-0"}),
+        ("booking", {"tool": "book_flight", "status": "success"}),
+        ("result", {"result": "booked Book a flight from JFK to LAX"}),
+    ]
+    assert in_flight == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    async def scenario():
+        _, app = make_app(None)
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await app({"type": "http", "method": "GET", "path": "/metrics", "headers": []}, receive, send)
+        return sent
+
+    sent = asyncio.run(scenario())
+
+    assert sent[0]["status"] == 200
+    assert b"# TYPE travel_agent_request_seconds histogram" in sent[1]["body"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
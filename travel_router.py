@@ -0,0 +1,296 @@
+"""Deterministic routing of free-text travel requests.
+
+The router decides which booking services a request needs and pulls out the
+details the specialist agents need (places, dates, hotel, nights) with a handful
+of precompiled regular expressions. It makes no LLM calls.
+"""
+import re
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+
+HOTEL_SERVICE = "hotel"
+FLIGHT_SERVICE = "flight"
+ALL_SERVICES = (HOTEL_SERVICE, FLIGHT_SERVICE)
+
+_HOTEL_BRANDS = r"marriott|hilton|hyatt|sheraton|westin|ritz|holiday\s+inn"
+_HOTEL_KEYWORDS = re.compile(
+    r"\b(?:hotels?|motels?|stays?|staying|accommodations?|lodging|rooms?|suites?|resorts?|nights?"
+    rf"|{_HOTEL_BRANDS})\b",
+    re.IGNORECASE,
+)
+_FLIGHT_KEYWORDS = re.compile(
+    r"\b(?:flights?|fly|flying|flew|airports?|airlines?|plane|boarding)\b",
+    re.IGNORECASE,
+)
+# Airport code pairs such as "BOS to SFO" only make sense as a flight
+_AIRPORT_PAIR = re.compile(r"\b(?P<origin>[A-Z]{3})\s+to\s+(?P<destination>[A-Z]{3})\b")
+
+# A place or hotel name: one or more capitalised words, e.g. "San Francisco", "JFK"
+_NAME = r"\b[A-Z][\w'&-]*(?:[ \t]+[A-Z][\w'&-]*)*"
+_ROUTE = re.compile(rf"\b(?i:from)\s+(?P<origin>{_NAME})\s+(?i:to)\s+(?P<destination>{_NAME})")
+# Hotel names are only taken next to a hotel keyword: "Marriott hotel", "hotel Marriott",
+# "room at the Hilton", or a brand such as "Holiday Inn Express"
+_HOTEL_NOUN = re.compile(r"(?:hotel|motel|resort)s?", re.IGNORECASE)
+_HOTEL_BEFORE_NOUN = re.compile(rf"(?P<hotel>{_NAME})\s+\Z")
+_HOTEL_AFTER_NOUN = re.compile(rf"\s+(?P<hotel>{_NAME})")
+_HOTEL_AFTER_AT = re.compile(rf"\s+at\s+(?:the\s+)?(?P<hotel>{_NAME})")
+_HOTEL_BRAND_NAME = re.compile(rf"(?P<hotel>(?i:{_HOTEL_BRANDS})(?:[ \t]+[A-Z][\w'&-]*)*)")
+_IN_PLACE = re.compile(rf"\bin\s+(?P<place>{_NAME})")
+
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)")
+_DATE = re.compile(
+    rf"\b(?:\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTH}(?:,?\s+\d{{4}})?"
+    rf"|{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?"
+    r"|\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}/\d{1,2}(?:/\d{2,4})?"
+    r"|today|tomorrow|next\s+(?:week|month|weekend))\b",
+    re.IGNORECASE,
+)
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+                 "eight": 8, "nine": 9, "ten": 10, "fourteen": 14}
+_NIGHTS = re.compile(rf"\b(?P<count>\d+|{'|'.join(_NUMBER_WORDS)})[\s-]+nights?\b", re.IGNORECASE)
+# Capitalised words next to a hotel keyword that are a request verb, a date or the other service
+_NOT_A_HOTEL_NAME = re.compile(
+    rf"(?:{_MONTH}|book|need|reserve|find|get|add|make|please|flights?|airport)",
+    re.IGNORECASE,
+)
+# What joins a date to the end of a range: "May 3 to May 6", "May 3 - May 6", "May 3-6"
+_DATE_RANGE_JOIN = re.compile(r"\s*(?:[-\u2013]|\b(?:to|until|till|through|thru|and)\b)\s*(?P<day>\d{1,2}\b)?",
+                              re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class HotelSlots:
+    """Arguments for the ``book_hotel`` tool."""
+    hotel_name: Optional[str]
+    city: Optional[str]
+    check_in_date: Optional[str]
+    nights: Optional[int] = None
+
+    def is_complete(self) -> bool:
+        return all((self.hotel_name, self.city, self.check_in_date, self.nights))
+
+    def as_tool_args(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class FlightSlots:
+    """Arguments for the ``book_flight`` tool."""
+    from_airport: Optional[str]
+    to_airport: Optional[str]
+    date: Optional[str]
+
+    def is_complete(self) -> bool:
+        return all((self.from_airport, self.to_airport, self.date))
+
+    def as_tool_args(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class TravelIntent:
+    """Structured view of a travel request."""
+    services: tuple
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    hotel_name: Optional[str] = None
+    hotel_city: Optional[str] = None
+    dates: tuple = ()
+    nights: Optional[int] = None
+    flight_date: Optional[str] = None
+    check_in_date: Optional[str] = None
+    # How many flight routes, hotels and date ranges the request names
+    route_count: int = 0
+    hotel_count: int = 0
+    date_range_count: int = 0
+
+    @property
+    def needs_hotel(self) -> bool:
+        return HOTEL_SERVICE in self.services
+
+    @property
+    def needs_flight(self) -> bool:
+        return FLIGHT_SERVICE in self.services
+
+    @property
+    def hotel_slots(self) -> Optional[HotelSlots]:
+        if not self.needs_hotel:
+            return None
+        return HotelSlots(self.hotel_name, self.hotel_city, self.check_in_date, self.nights)
+
+    @property
+    def flight_slots(self) -> Optional[FlightSlots]:
+        if not self.needs_flight:
+            return None
+        return FlightSlots(self.origin, self.destination, self.flight_date)
+
+    def or_all_services(self) -> "TravelIntent":
+        """This intent, or for a request that names no service, one for every service.
+
+        "I want to travel to Paris" needs the full crew to work out what to book; a
+        crew without specialists could not book anything.
+        """
+        return self if self.services else replace(self, services=ALL_SERVICES)
+
+    def has_complete_slots(self) -> bool:
+        """True when every needed service can be booked without asking an agent.
+
+        The slots hold one booking per service, so a request naming several routes,
+        hotels or date ranges is never complete, and neither is a stay whose nights
+        the request does not state.
+        """
+        if max(self.route_count, self.hotel_count, self.date_range_count) > 1:
+            return False
+        slots = [slot for slot in (self.hotel_slots, self.flight_slots) if slot is not None]
+        return bool(slots) and all(slot.is_complete() for slot in slots)
+
+
+def _strip_trailing_keyword(name: Optional[str]) -> Optional[str]:
+    # "Marriott Hotel" and "Mumbai Airport" should route to "Marriott" and "Mumbai"
+    if name is None:
+        return None
+    words = name.split()
+    while len(words) > 1 and words[-1].lower() in ("hotel", "airport"):
+        words.pop()
+    return " ".join(words)
+
+
+def _hotel_name(travel_request: str, match) -> Optional[str]:
+    """The name ``match`` found next to a hotel keyword, or None when it is no name."""
+    words = match.group("hotel").split()
+    before = travel_request[:match.start("hotel")].rstrip()
+    if not before or before[-1] in ".!?":
+        # "Need hotel in Rome": the word is capitalised because it opens the sentence
+        words.pop(0)
+    while words and _NOT_A_HOTEL_NAME.fullmatch(words[0]):
+        words.pop(0)
+    return _strip_trailing_keyword(" ".join(words)) if words else None
+
+
+def _find_hotels(travel_request: str) -> list:
+    """Return ``(name, start, end)`` of every hotel named next to a hotel keyword."""
+    hotels = []
+    for keyword in _HOTEL_KEYWORDS.finditer(travel_request):
+        if hotels and keyword.start() < hotels[-1][2]:
+            continue
+        brand = _HOTEL_BRAND_NAME.match(travel_request, keyword.start())
+        if brand:
+            hotels.append((_strip_trailing_keyword(brand.group("hotel")), brand.start(), brand.end()))
+            continue
+        candidates = [_HOTEL_AFTER_AT.match(travel_request, keyword.end())]
+        if _HOTEL_NOUN.fullmatch(keyword.group(0)):
+            candidates.append(_HOTEL_AFTER_NOUN.match(travel_request, keyword.end()))
+            candidates.append(_HOTEL_BEFORE_NOUN.search(travel_request, 0, keyword.start()))
+        for match in filter(None, candidates):
+            name = _hotel_name(travel_request, match)
+            if name:
+                hotels.append((name, match.start("hotel"), match.end("hotel")))
+                break
+    return hotels
+
+
+def _count_hotels(travel_request: str, hotels: list) -> int:
+    """Distinct hotel names or hotel nouns, whichever is more; "hotels" alone counts two."""
+    nouns = [match.group(0).lower() for match in _HOTEL_KEYWORDS.finditer(travel_request)
+             if _HOTEL_NOUN.fullmatch(match.group(0))]
+    count = max(len({name.casefold() for name, _, _ in hotels}), len(nouns))
+    return max(count, 2) if any(noun.endswith("s") for noun in nouns) else count
+
+
+def _count_routes(travel_request: str) -> int:
+    """Routes such as "from Boston to Paris", plus airport pairs outside them."""
+    routes = [match.span() for match in _ROUTE.finditer(travel_request)]
+    pairs = [match for match in _AIRPORT_PAIR.finditer(travel_request)
+             if not any(start <= match.start() < end for start, end in routes)]
+    return len(routes) + len(pairs)
+
+
+def _count_date_ranges(travel_request: str, dates: list) -> int:
+    count = 0
+    for date, following in zip(dates, dates[1:] + [None]):
+        join = _DATE_RANGE_JOIN.match(travel_request, date.end())
+        if join and (join.group("day") or (following is not None and following.start() == join.end())):
+            count += 1
+    return count
+
+
+def _assign_dates(dates: list, anchors: dict) -> dict:
+    """Give each service the first date mentioned after it and before the next service."""
+    if not anchors:
+        return {}
+    ordered = sorted(anchors.items(), key=lambda item: item[1])
+    assigned = {}
+    for date in dates:
+        owner = ordered[0][0]
+        for service, position in ordered:
+            if position <= date.start():
+                owner = service
+        assigned.setdefault(owner, date.group(0))
+    return assigned
+
+
+def route_travel_request(travel_request: str) -> TravelIntent:
+    """Return the services a request needs and the booking details it mentions."""
+    airport_pair = _AIRPORT_PAIR.search(travel_request)
+    hotel_keyword = _HOTEL_KEYWORDS.search(travel_request)
+    flight_keyword = _FLIGHT_KEYWORDS.search(travel_request) or airport_pair
+    services = []
+    if hotel_keyword:
+        services.append(HOTEL_SERVICE)
+    if flight_keyword:
+        services.append(FLIGHT_SERVICE)
+
+    origin = destination = None
+    route = _ROUTE.search(travel_request) or airport_pair
+    if route:
+        origin = _strip_trailing_keyword(route.group("origin"))
+        destination = _strip_trailing_keyword(route.group("destination"))
+
+    anchors = {}
+    if flight_keyword:
+        anchors[FLIGHT_SERVICE] = min(flight_keyword.start(), route.start()) if route else flight_keyword.start()
+
+    hotel_name = hotel_city = None
+    hotel_count = 0
+    if hotel_keyword:
+        anchors[HOTEL_SERVICE] = hotel_keyword.start()
+        hotels = _find_hotels(travel_request)
+        hotel = hotels[0] if hotels else None
+        if hotel:
+            hotel_name, hotel_start, hotel_end = hotel
+            anchors[HOTEL_SERVICE] = min(anchors[HOTEL_SERVICE], hotel_start)
+        place = _IN_PLACE.search(travel_request, hotel_end if hotel else hotel_keyword.start())
+        if place:
+            hotel_city = _strip_trailing_keyword(place.group("place"))
+        if hotel_city is None:
+            hotel_city = destination
+        hotel_count = _count_hotels(travel_request, hotels)
+
+    dates = list(_DATE.finditer(travel_request))
+    service_dates = _assign_dates(dates, anchors)
+    flight_date = service_dates.get(FLIGHT_SERVICE)
+    # Like the hotel agent's backstory: without its own date the stay starts on the flight date
+    check_in_date = service_dates.get(HOTEL_SERVICE, flight_date)
+
+    nights = None
+    nights_match = _NIGHTS.search(travel_request)
+    if nights_match:
+        count = nights_match.group("count").lower()
+        nights = int(count) if count.isdigit() else _NUMBER_WORDS[count]
+
+    return TravelIntent(
+        services=tuple(services),
+        origin=origin,
+        destination=destination,
+        hotel_name=hotel_name,
+        hotel_city=hotel_city,
+        dates=tuple(match.group(0) for match in dates),
+        nights=nights,
+        flight_date=flight_date,
+        check_in_date=check_in_date,
+        route_count=_count_routes(travel_request),
+        hotel_count=hotel_count,
+        date_range_count=_count_date_ranges(travel_request, dates),
+    )
@@ -0,0 +1,330 @@
+"""ASGI service for the travel agent.
+
+Endpoints:
+    POST /bookings  {"request": "...", "session_id": "..."(optional), "idempotency_key": "..."(optional)}
+                    -> 200 {"session_id": ..., "result": ...}
+    POST /bookings/stream  same body
+                    -> 200 text/event-stream: ``session``, then ``booking`` and ``task``
+                       events as the crew makes progress, then ``result`` or ``error``
+    GET  /health    -> 200 {"status": "ok" | "draining", "in_flight": n, "queued": n}
+    GET  /metrics   -> 200 latency, tool and token histograms in the Prometheus text format
+
+At most ``max_workers`` requests run at once, each crew on a thread of the
+service's own executor, and up to ``max_queue`` more wait for a worker. Beyond
+that the service answers 429 with a ``Retry-After`` header. Bodies over 64 KiB are
+answered 413. A retried request carries the same ``Idempotency-Key`` header (or
+``idempotency_key`` body field) and books nothing twice; a request without one is
+always booked. On shutdown it stops accepting requests (503) and waits for the
+accepted ones to finish.
+
+Usage:
+    python travel_server.py [--host 127.0.0.1] [--port 8000]
+or
+    uvicorn travel_server:app
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from request_metrics import render_metrics
+
+MAX_WORKERS = int(os.environ.get("TRAVEL_AGENT_SERVER_WORKERS", "4"))
+MAX_QUEUE = int(os.environ.get("TRAVEL_AGENT_SERVER_QUEUE", "16"))
+DRAIN_TIMEOUT = float(os.environ.get("TRAVEL_AGENT_SERVER_DRAIN_TIMEOUT", "120"))
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ServiceSaturated(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class ServiceDraining(Exception):
+    """The service is shutting down and no longer accepts requests."""
+
+
+class RequestBodyTooLarge(Exception):
+    """The request body is larger than ``MAX_BODY_BYTES``."""
+
+
+async def run_travel_request_in_session(travel_request: str, session_id: str, idempotency_key: Optional[str] = None,
+                                        executor: Executor = None) -> str:
+    """Default request handler: run the crew on ``executor`` inside a Monocle session scope."""
+    from crewai_travel_agent import execute_crewai_travel_request_async, monocle_trace_scope
+    with monocle_trace_scope("agentic.session", session_id):
+        return await execute_crewai_travel_request_async(travel_request, idempotency_key=idempotency_key,
+                                                         session_id=session_id, executor=executor)
+
+
+async def stream_travel_request_in_session(travel_request: str, session_id: str, idempotency_key: Optional[str] = None,
+                                           executor: Executor = None) -> AsyncIterator[dict]:
+    """Default streaming handler: yield the crew's progress events inside a Monocle session scope."""
+    from crewai_travel_agent import monocle_trace_scope, stream_crewai_travel_request
+    with monocle_trace_scope("agentic.session", session_id):
+        async for event in stream_crewai_travel_request(travel_request, idempotency_key=idempotency_key,
+                                                        session_id=session_id, executor=executor):
+            yield event
+
+
+class TravelAgentService:
+    """Bounded worker pool with a bounded wait queue in front of a request handler.
+
+    The default handlers run the crews on ``executor``, a pool of ``max_workers``
+    threads owned by the service. The event loop's default executor stays free for
+    DNS lookups and other ``asyncio.to_thread`` work. Handlers are called with the
+    request text, the session ID and the request's idempotency key (or None).
+    """
+
+    def __init__(self, handler: Optional[Callable[[str, str, Optional[str]], Awaitable[str]]] = None,
+                 max_workers: int = MAX_WORKERS, max_queue: int = MAX_QUEUE,
+                 stream_handler: Optional[Callable[[str, str, Optional[str]], AsyncIterator[dict]]] = None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="travel-agent")
+        self.handler = handler or functools.partial(run_travel_request_in_session, executor=self.executor)
+        self.stream_handler = stream_handler or functools.partial(stream_travel_request_in_session,
+                                                                  executor=self.executor)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self.draining = False
+        self._workers = asyncio.Semaphore(max_workers)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a worker for the ``async with`` block, waiting in the queue if needed.
+
+        Raises ``ServiceDraining`` or ``ServiceSaturated`` on entry when the request
+        cannot be accepted.
+        """
+        if self.draining:
+            raise ServiceDraining()
+        if self.in_flight + self.queued >= self.max_workers + self.max_queue:
+            raise ServiceSaturated()
+        self.queued += 1
+        self._idle.clear()
+        try:
+            await self._workers.acquire()
+        except BaseException:
+            self.queued -= 1
+            self._update_idle()
+            raise
+        self.queued -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._workers.release()
+            self._update_idle()
+
+    async def submit(self, travel_request: str, session_id: str, idempotency_key: Optional[str] = None) -> str:
+        async with self.slot():
+            return await self.handler(travel_request, session_id, idempotency_key)
+
+    def _update_idle(self):
+        if not self.in_flight and not self.queued:
+            self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = DRAIN_TIMEOUT) -> bool:
+        """Stop accepting requests and wait for accepted ones. Returns False on timeout.
+
+        The crew executor is shut down either way; crews still running finish in their threads.
+        """
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise RequestBodyTooLarge()
+        if not message.get("more_body"):
+            return body
+
+
+async def _send_json(send, status: int, payload: dict, headers: Optional[list] = None):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+                   + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1").strip()
+    return None
+
+
+def _sse_event(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def _generate_session_id() -> str:
+    from crewai_travel_agent import generate_session_id
+    return generate_session_id()
+
+
+def _init_travel_agent():
+    from crewai_travel_agent import init
+    init()
+
+
+def create_app(service: Optional[TravelAgentService] = None, drain_timeout: float = DRAIN_TIMEOUT,
+               session_id_factory: Callable[[], str] = _generate_session_id,
+               startup: Optional[Callable[[], None]] = _init_travel_agent):
+    """Build the ASGI application around a ``TravelAgentService``.
+
+    ``startup`` runs in a worker thread during lifespan startup, so the agent's
+    imports and telemetry setup are paid before the first request.
+    """
+    state = {"service": service}
+
+    def get_service() -> TravelAgentService:
+        # Created lazily so the semaphore belongs to the server's event loop
+        if state["service"] is None:
+            state["service"] = TravelAgentService()
+        return state["service"]
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                get_service()
+                if startup is not None:
+                    await asyncio.to_thread(startup)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await get_service().drain(drain_timeout)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def read_booking_request(scope, receive, send) -> Optional[tuple]:
+        """Parse a booking request into ``(travel_request, session_id, idempotency_key)``, answering 413 or
+        400 if it is invalid.
+
+        The idempotency key comes from the ``Idempotency-Key`` header or else the
+        ``idempotency_key`` body field. The session ID is not one: a session's turns
+        are different requests.
+        """
+        try:
+            payload = json.loads(await _read_body(receive) or b"{}")
+        except RequestBodyTooLarge:
+            await _send_json(send, 413, {"error": f"Request body is larger than {MAX_BODY_BYTES} bytes"})
+            return None
+        except ValueError as error:
+            await _send_json(send, 400, {"error": f"Invalid request body: {error}"})
+            return None
+        travel_request = payload.get("request") if isinstance(payload, dict) else None
+        if not isinstance(travel_request, str) or not travel_request.strip():
+            await _send_json(send, 400, {"error": "Body must be a JSON object with a non-empty 'request'"})
+            return None
+        session_id = payload.get("session_id")
+        idempotency_key = _header(scope, b"idempotency-key") or payload.get("idempotency_key")
+        for field, value in (("session_id", session_id), ("idempotency_key", idempotency_key)):
+            if value is not None and not isinstance(value, str):
+                await _send_json(send, 400, {"error": f"'{field}' must be a string"})
+                return None
+        return travel_request.strip(), session_id or session_id_factory(), idempotency_key or None
+
+    async def send_rejection(send, error: Exception):
+        if isinstance(error, ServiceSaturated):
+            return await _send_json(send, 429, {"error": "Too many requests in progress, retry later"},
+                                    [(b"retry-after", b"1")])
+        await _send_json(send, 503, {"error": "Service is shutting down"})
+
+    async def bookings(scope, receive, send):
+        booking_request = await read_booking_request(scope, receive, send)
+        if booking_request is None:
+            return
+        travel_request, session_id, idempotency_key = booking_request
+        try:
+            result = await get_service().submit(travel_request, session_id, idempotency_key)
+        except (ServiceSaturated, ServiceDraining) as error:
+            return await send_rejection(send, error)
+        except Exception as error:
+            return await _send_json(send, 500, {"session_id": session_id, "error": str(error)})
+        await _send_json(send, 200, {"session_id": session_id, "result": result})
+
+    async def stream_bookings(scope, receive, send):
+        booking_request = await read_booking_request(scope, receive, send)
+        if booking_request is None:
+            return
+        travel_request, session_id, idempotency_key = booking_request
+        service = get_service()
+        try:
+            async with service.slot():
+                await send({
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")],
+                })
+                await send({"type": "http.response.body", "body": _sse_event("session", {"session_id": session_id}),
+                            "more_body": True})
+                try:
+                    async for event in service.stream_handler(travel_request, session_id, idempotency_key):
+                        await send({"type": "http.response.body", "body": _sse_event(event["event"], event["data"]),
+                                    "more_body": True})
+                except Exception as error:
+                    # Headers are already sent, so failures are reported in-stream
+                    await send({"type": "http.response.body", "body": _sse_event("error", {"error": str(error)}),
+                                "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+        except (ServiceSaturated, ServiceDraining) as error:
+            await send_rejection(send, error)
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+        method, path = scope["method"], scope["path"]
+        if path == "/bookings" and method == "POST":
+            return await bookings(scope, receive, send)
+        if path == "/bookings/stream" and method == "POST":
+            return await stream_bookings(scope, receive, send)
+        if path == "/health" and method == "GET":
+            service = get_service()
+            return await _send_json(send, 200, {"status": "draining" if service.draining else "ok",
+                                                "in_flight": service.in_flight, "queued": service.queued})
+        if path == "/metrics" and method == "GET":
+            body = render_metrics().encode()
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"text/plain; version=0.0.4"),
+                                    (b"content-length", str(len(body)).encode())]})
+            return await send({"type": "http.response.body", "body": body})
+        await _send_json(send, 404, {"error": f"No route for {method} {path}"})
+
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, timeout_graceful_shutdown=int(DRAIN_TIMEOUT))